@@ -59,7 +59,8 @@ def _get_splits(obj) -> typing.Tuple[typing.Any, typing.Iterable]:
     else:
         head = _SplitHead(num_slice)
         _max_size = getattr(obj, __FATE_BIG_OBJ_MAX_PART_SIZE)
-        kv = [(i, obj_bytes[slice(i * _max_size, (i + 1) * _max_size)]) for i in range(num_slice)]
+        # parts are sliced lazily while being pushed, so that all parts are not held in memory together
+        kv = ((i, obj_bytes[slice(i * _max_size, (i + 1) * _max_size)]) for i in range(num_slice))
         return head, kv
 
 
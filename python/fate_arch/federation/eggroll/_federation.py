@@ -182,11 +182,12 @@ def _get_value_post_process(v, name, tag, party, rsc, gc):
     if _is_split_head(v):
         num_split = v.num_split()
         LOGGER.debug(f"[{log_str}]is split object, num_split={num_split}")
+        # pull all splits at once, pulls run in roll site's executor instead of one after another
+        split_futures = [rsc.load(name, tag=f"{tag}.__part_{k}").pull([party])[0] for k in range(num_split)]
         split_objs = []
-        for k in range(num_split):
-            split_obj = _split_rs = rsc.load(name, tag=f"{tag}.__part_{k}").pull([party])[0].result()
+        for k, split_future in enumerate(split_futures):
+            split_objs.append(split_future.result())
             LOGGER.debug(f"[{log_str}]got split ({k}/{num_split})")
-            split_objs.append(split_obj)
         obj = _split_get(split_objs)
 
         LOGGER.debug(f"[{log_str}] got split object with type: {type(obj)}")
@@ -308,16 +308,19 @@ class BoostingParam(BaseParam):
 class HeteroBoostingParam(BoostingParam):
 
     """
-    encrypt_param : EncodeParam Object, encrypt method use in secure boost, default: EncryptParam()
+    encrypt_param : EncodeParam Object, encrypt method use in secure boost,
+                    default: EncryptParam(method=None), IterativeAffine is used when method is not set,
+                    Paillier was used in previous versions
 
     encrypted_mode_calculator_param: EncryptedModeCalculatorParam object, the calculation mode use in secureboost,
-                                     default: EncryptedModeCalculatorParam()
+                                     default: EncryptedModeCalculatorParam(), in 'balance' mode encrypted confusions
+                                     are re-generated every ceil(1 / re_encrypted_rate) boosting rounds
     """
 
     def __init__(self, task_type=consts.CLASSIFICATION,
                  objective_param=ObjectiveParam(),
                  learning_rate=0.3, num_trees=5, subsample_feature_rate=1.0, n_iter_no_change=True,
-                 tol=0.0001, encrypt_param=EncryptParam(),
+                 tol=0.0001, encrypt_param=EncryptParam(method=None),
                  bin_num=32,
                  encrypted_mode_calculator_param=EncryptedModeCalculatorParam(),
                  predict_param=PredictParam(), cv_param=CrossValidationParam(),
@@ -376,15 +379,24 @@ class HeteroSecureBoostParam(HeteroBoostingParam):
         subsample_random_seed: seed that controls feature subsample
 
         n_iter_no_change : bool,
-            when True and residual error less than tol, tree building process will stop. default: True
+            when True and residual error less than tol, tree building process will stop. default: True.
+            guest and host exchange a stop flag every round only when it is True, so it should be set to
+            the same value on both guest and host
 
-        encrypt_param : EncodeParam Object, encrypt method use in secure boost, default: EncryptParam(), this parameter
-                        is only for hetero-secureboost
+        encrypt_param : EncodeParam Object, encrypt method use in secure boost,
+                        default: EncryptParam(method=None), IterativeAffine is used when method is not set,
+                        this parameter is only for hetero-secureboost.
+                        IterativeAffine is much cheaper than Paillier and is recommended for two-party secureboost,
+                        where only guest holds the key, but it is a non-standard scheme and weaker than Paillier.
+                        Paillier was used when method is not set in previous versions, set method='Paillier' to keep it
 
         bin_num: int, positive integer greater than 1, bin number use in quantile. default: 32
 
         encrypted_mode_calculator_param: EncryptedModeCalculatorParam object, the calculation mode use in secureboost,
-                                         default: EncryptedModeCalculatorParam(), only for hetero-secureboost
+                                         default: EncryptedModeCalculatorParam(), only for hetero-secureboost.
+                                         in 'balance' mode encrypted confusions are re-generated every
+                                         ceil(1 / re_encrypted_rate) boosting rounds, e.g. mode='balance',
+                                         re_encrypted_rate=0.2 reuses them across 5 rounds
 
         use_missing: bool, accepted True, False only, use missing value in training process or not. default: False
 
@@ -420,19 +432,25 @@ class HeteroSecureBoostParam(HeteroBoostingParam):
         run_fast_histogram: bool, Available when encrypted method is 'iterativeAffine'
                             An optimized mode for high-dimension, sparse data.
 
+        gh_pack: bool, only available when encrypted method is 'Paillier', default: False
+                 quantize grad and hess of a sample to quant_bits integers and pack them into one plaintext,
+                 so that only one ciphertext per sample is encrypted and sent to hosts
+
+        quant_bits: int, bits used to quantize grad and hess when gh_pack is True, default: 16
+
         """
 
     def __init__(self, tree_param: DecisionTreeParam = DecisionTreeParam(), task_type=consts.CLASSIFICATION,
                  objective_param=ObjectiveParam(),
                  learning_rate=0.3, num_trees=5, subsample_feature_rate=1.0, n_iter_no_change=True,
-                 tol=0.0001, encrypt_param=EncryptParam(),
+                 tol=0.0001, encrypt_param=EncryptParam(method=None),
                  bin_num=32,
                  encrypted_mode_calculator_param=EncryptedModeCalculatorParam(),
                  predict_param=PredictParam(), cv_param=CrossValidationParam(),
                  validation_freqs=None, early_stopping_rounds=None, use_missing=False, zero_as_missing=False,
                  complete_secure=False, metrics=None, use_first_metric_only=False, subsample_random_seed=None,
                  binning_error=consts.DEFAULT_RELATIVE_ERROR,
-                 sparse_optimization=False):
+                 sparse_optimization=False, gh_pack=False, quant_bits=16):
 
         super(HeteroSecureBoostParam, self).__init__(task_type, objective_param, learning_rate, num_trees,
                                                      subsample_feature_rate, n_iter_no_change, tol, encrypt_param,
@@ -447,6 +465,8 @@ class HeteroSecureBoostParam(HeteroBoostingParam):
         self.use_missing = use_missing
         self.complete_secure = complete_secure
         self.sparse_optimization = sparse_optimization
+        self.gh_pack = gh_pack
+        self.quant_bits = quant_bits
 
     def check(self):
 
@@ -458,6 +478,11 @@ class HeteroSecureBoostParam(HeteroBoostingParam):
             raise ValueError('zero as missing should be bool type')
         self.check_boolean(self.complete_secure, 'complete_secure')
         self.check_boolean(self.run_fast_histogram, 'run_fast_histogram')
+        self.check_boolean(self.gh_pack, 'gh_pack')
+        if type(self.quant_bits).__name__ not in ["int", "long"] or self.quant_bits < 2:
+            raise ValueError("quant_bits should be an integer larger than 1")
+        if self.gh_pack and self.encrypt_param.method != consts.PAILLIER:
+            raise ValueError('gh_pack is only supported when encrypt method is {}'.format(consts.PAILLIER))
 
         return True
 
@@ -467,7 +492,7 @@ class HeteroFastSecureBoostParam(HeteroSecureBoostParam):
     def __init__(self, tree_param: DecisionTreeParam = DecisionTreeParam(), task_type=consts.CLASSIFICATION,
                  objective_param=ObjectiveParam(),
                  learning_rate=0.3, num_trees=5, subsample_feature_rate=1.0, n_iter_no_change=True,
-                 tol=0.0001, encrypt_param=EncryptParam(),
+                 tol=0.0001, encrypt_param=EncryptParam(method=None),
                  bin_num=32,
                  encrypted_mode_calculator_param=EncryptedModeCalculatorParam(),
                  predict_param=PredictParam(), cv_param=CrossValidationParam(),
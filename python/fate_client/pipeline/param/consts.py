@@ -33,6 +33,7 @@ NONE = "None"
 AFFINE = 'Affine'
 ITERATIVEAFFINE = 'IterativeAffine'
 RANDOM_ITERATIVEAFFINE = 'RandomIterativeAffine'
+IPCL = 'IPCL'
 L1_PENALTY = 'L1'
 L2_PENALTY = 'L2'
 
@@ -36,7 +36,7 @@ class FTLParam(BaseParam):
                  encrypte_param=EncryptParam(),
                  encrypted_mode_calculator_param=EncryptedModeCalculatorParam(mode="confusion_opt"),
                  predict_param=PredictParam(), mode='plain', communication_efficient=False,
-                 local_round=5,):
+                 local_round=5, sparse_push=False, push_eps=1e-4, staleness=0):
 
         """
         Args:
@@ -73,6 +73,16 @@ class FTLParam(BaseParam):
                 bool, will use communication efficient or not. when communication efficient is enabled, FTL model will
                 update gradients by several local rounds using intermediate data
             local_round: local update round when using communication efficient
+            sparse_push: bool, if enabled, after the first epoch only rows of exchanged components whose
+                max absolute change since last push is larger than push_eps are sent (and encrypted) to the other
+                party, which keeps the rest of rows received before. should be set on both guest and host.
+                Default: False
+            push_eps: float, threshold of row change for sparse_push, default: 1e-4
+            staleness: int, bounded staleness of exchanged components. at epoch k, components the other party sent at
+                epoch k - staleness are used, so that parties do not wait for components sent in the same epoch.
+                0 means synchronous training. training results differ from synchronous training as stale components
+                are used. should be set on both guest and host. only supported in plain mode, encrypted mode still
+                waits for synchronous decryption exchanges every round. Default: 0
         """
 
         super(FTLParam, self).__init__()
@@ -92,6 +102,9 @@ class FTLParam(BaseParam):
         self.mode = mode
         self.communication_efficient = communication_efficient
         self.local_round = local_round
+        self.sparse_push = sparse_push
+        self.push_eps = push_eps
+        self.staleness = staleness
 
     def check(self):
         self.intersect_param.check()
@@ -130,6 +143,12 @@ class FTLParam(BaseParam):
         assert type(self.communication_efficient) is bool, 'communication efficient must be a boolean'
         assert self.mode in ['encrypted', 'plain'], 'mode options: encrpyted or plain, but {} is offered'.format(self.mode)
         assert type(self.epochs) == int and self.epochs > 0
+        self.check_boolean(self.sparse_push, 'sparse push')
+        self.check_nonnegative_number(self.push_eps, 'push eps')
+        if type(self.staleness) is not int or self.staleness < 0:
+            raise ValueError("staleness {} not supported, should be non-negative integer".format(self.staleness))
+        if self.staleness > 0 and self.mode == 'encrypted':
+            raise ValueError("staleness is only supported in plain mode")
 
     @staticmethod
     def _parse_optimizer(opt):
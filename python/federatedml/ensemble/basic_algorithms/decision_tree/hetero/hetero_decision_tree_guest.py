@@ -28,6 +28,9 @@ class HeteroDecisionTreeGuest(DecisionTree):
 
         self.host_party_idlist = []
 
+        # g/h are packed into one plaintext before encryption if gh_packer is set
+        self.gh_packer = None
+
     """
     Node Encode/ Decode
     """
@@ -82,6 +85,9 @@ class HeteroDecisionTreeGuest(DecisionTree):
     def set_host_party_idlist(self, host_list):
         self.host_party_idlist = host_list
 
+    def set_gh_packer(self, gh_packer):
+        self.gh_packer = gh_packer
+
     """
     Encrypt/ Decrypt
     """
@@ -109,8 +115,12 @@ class HeteroDecisionTreeGuest(DecisionTree):
 
         for i in range(len(encrypted_splitinfo_host)):
             sum_grad_l, sum_hess_l = encrypted_splitinfo_host[i]
-            sum_grad_l = self.decrypt(sum_grad_l)
-            sum_hess_l = self.decrypt(sum_hess_l)
+            if self.gh_packer is not None:
+                # hess is packed into sum_grad, sum_hess is a plain 0
+                sum_grad_l, sum_hess_l = self.gh_packer.unpack(self.decrypt(sum_grad_l))
+            else:
+                sum_grad_l = self.decrypt(sum_grad_l)
+                sum_hess_l = self.decrypt(sum_hess_l)
             sum_grad_r = sum_grad - sum_grad_l
             sum_hess_r = sum_hess - sum_hess_l
             gain = self.splitter.split_gain(sum_grad, sum_hess, sum_grad_l,
@@ -146,10 +156,15 @@ class HeteroDecisionTreeGuest(DecisionTree):
 
             # when this node can not be further split, host sum_grad and sum_hess is not an encrypted number but 0
             # so need type checking here
-            best_splitinfo.sum_grad = self.decrypt(best_splitinfo.sum_grad) \
-                if type(best_splitinfo.sum_grad) != int else best_splitinfo.sum_grad
-            best_splitinfo.sum_hess = self.decrypt(best_splitinfo.sum_hess) \
-                if type(best_splitinfo.sum_hess) != int else best_splitinfo.sum_hess
+            if self.gh_packer is not None:
+                if type(best_splitinfo.sum_grad) != int:
+                    best_splitinfo.sum_grad, best_splitinfo.sum_hess = \
+                        self.gh_packer.unpack(self.decrypt(best_splitinfo.sum_grad))
+            else:
+                best_splitinfo.sum_grad = self.decrypt(best_splitinfo.sum_grad) \
+                    if type(best_splitinfo.sum_grad) != int else best_splitinfo.sum_grad
+                best_splitinfo.sum_hess = self.decrypt(best_splitinfo.sum_hess) \
+                    if type(best_splitinfo.sum_hess) != int else best_splitinfo.sum_hess
             best_splitinfo.gain = best_gain_host
 
         return best_splitinfo
@@ -252,7 +267,13 @@ class HeteroDecisionTreeGuest(DecisionTree):
     """
 
     def sync_encrypted_grad_and_hess(self, idx=-1):
-        encrypted_grad_and_hess = self.encrypted_mode_calculator.encrypt(self.grad_and_hess)
+        if self.gh_packer is not None:
+            # one ciphertext per sample, host sums the plain 0 in place of hess without any change
+            packed_grad_and_hess = self.grad_and_hess.mapValues(self.gh_packer.pack)
+            encrypted_grad_and_hess = self.encrypted_mode_calculator.encrypt(packed_grad_and_hess).mapValues(
+                lambda encrypted_packed: (encrypted_packed, 0))
+        else:
+            encrypted_grad_and_hess = self.encrypted_mode_calculator.encrypt(self.grad_and_hess)
 
         self.transfer_inst.encrypted_grad_and_hess.remote(encrypted_grad_and_hess,
                                                           role=consts.HOST,
@@ -1,4 +1,5 @@
 import functools
+import logging
 from federatedml.ensemble.basic_algorithms import HeteroDecisionTreeGuest
 from federatedml.ensemble.boosting.hetero import hetero_fast_secureboost_plan as plan
 from federatedml.util import consts
@@ -268,7 +269,9 @@ class HeteroFastDecisionTreeGuest(HeteroDecisionTreeGuest):
                                               zero_as_missing=self.zero_as_missing,
                                               missing_dir_maskdict=self.missing_dir_maskdict)
             predict_result = predict_data.join(data_inst, traverse_tree)
-            LOGGER.debug('guest_predict_inst_count is {}'.format(predict_result.count()))
+            # count() runs a job over the table, skip it unless it is logged
+            if LOGGER.isEnabledFor(logging.DEBUG):
+                LOGGER.debug('guest_predict_inst_count is {}'.format(predict_result.count()))
 
         else:
             LOGGER.debug('predicting using host local tree')
@@ -353,7 +356,8 @@ class HeteroFastDecisionTreeGuest(HeteroDecisionTreeGuest):
         if self.tree_type == plan.tree_type_dict['guest_feat_only'] or \
                 self.tree_type == plan.tree_type_dict['host_feat_only']:
             predict_res = self.mix_mode_predict(data_inst)
-            LOGGER.debug('input result count {} , out count {}'.format(data_inst.count(), predict_res.count()))
+            if LOGGER.isEnabledFor(logging.DEBUG):
+                LOGGER.debug('input result count {} , out count {}'.format(data_inst.count(), predict_res.count()))
             return predict_res
         else:
             LOGGER.debug('running layered mode predict')
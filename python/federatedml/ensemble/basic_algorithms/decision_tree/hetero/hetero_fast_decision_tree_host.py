@@ -6,6 +6,7 @@ from federatedml.ensemble.basic_algorithms.decision_tree.tree_core.node import N
 from federatedml.feature.fate_element_type import NoneType
 from federatedml.util import LOGGER
 import functools
+import logging
 import copy
 
 
@@ -408,7 +409,9 @@ class HeteroFastDecisionTreeHost(HeteroDecisionTreeHost):
                                               use_missing=self.use_missing,
                                               zero_as_missing=self.zero_as_missing, )
             leaf_nodes = data_inst.mapValues(traverse_tree)
-            LOGGER.debug('leaf nodes count is {}'.format(leaf_nodes.count()))
+            # count() runs a job over the table, skip it unless it is logged
+            if LOGGER.isEnabledFor(logging.DEBUG):
+                LOGGER.debug('leaf nodes count is {}'.format(leaf_nodes.count()))
             self.sync_sample_leaf_pos(leaf_nodes)
         else:
             LOGGER.info('this tree belongs to other parties, skip prediction')
@@ -0,0 +1,73 @@
+#
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+
+from federatedml.util import consts
+
+
+class PackedEncoder(object):
+    """
+    Quantize grad and hess of a sample to quant_bits integers and pack them into one plaintext,
+    so that g/h of a sample only need one ciphertext.
+
+    packed = g_int << h_bits + h_int, hess lane has quant_bits + bit length of sample number bits,
+    so that sums of packed values of any subset of samples can be unpacked after decryption.
+    Packed plaintexts are integers, only encrypters that add integers exactly (Paillier) are supported.
+
+    Parameters
+    ----------
+    g_max: float, max absolute value of grad
+
+    h_max: float, max value of hess, hess is non-negative
+
+    sample_num: int, number of samples, bounds the number of packed values being summed
+
+    quant_bits: int, bits used to quantize grad and hess
+    """
+
+    def __init__(self, g_max, h_max, sample_num, quant_bits=16):
+        self.quant_bits = quant_bits
+        self.g_scale = ((1 << (quant_bits - 1)) - 1) / g_max if g_max > consts.FLOAT_ZERO else 1.0
+        self.h_scale = ((1 << quant_bits) - 1) / h_max if h_max > consts.FLOAT_ZERO else 1.0
+        self.h_bits = quant_bits + int(sample_num).bit_length()
+        self.h_mask = (1 << self.h_bits) - 1
+
+    @classmethod
+    def from_grad_and_hess(cls, grad_and_hess, quant_bits=16):
+        """
+        generate a PackedEncoder whose scales fit g/h of a round
+
+        Parameters
+        ----------
+        grad_and_hess: DTable, values are (grad, hess) of samples
+        """
+        g_max, h_max, sample_num = grad_and_hess.mapValues(lambda g_h: (abs(g_h[0]), g_h[1], 1)).reduce(
+            lambda a, b: (max(a[0], b[0]), max(a[1], b[1]), a[2] + b[2]))
+        return cls(g_max, h_max, sample_num, quant_bits)
+
+    def pack(self, g_h):
+        g, h = g_h
+        g_int = int(round(g * self.g_scale))
+        h_int = max(0, int(round(h * self.h_scale)))
+        return (g_int << self.h_bits) + h_int
+
+    def unpack(self, packed):
+        """
+        return grad and hess of a decrypted packed value (or sum of packed values)
+        """
+        packed = int(packed)
+        h_int = packed & self.h_mask
+        g_int = packed >> self.h_bits
+        return g_int / self.g_scale, h_int / self.h_scale
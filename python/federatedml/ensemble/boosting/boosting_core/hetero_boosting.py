@@ -19,9 +19,12 @@
 
 from abc import ABC
 import abc
+import functools
+import numpy as np
 from federatedml.ensemble.boosting.boosting_core import Boosting
 from federatedml.param.boosting_param import HeteroBoostingParam
 from federatedml.secureprotol import IterativeAffineEncrypt
+from federatedml.secureprotol import IpclPaillierEncrypt
 from federatedml.secureprotol import PaillierEncrypt
 from federatedml.secureprotol.encrypt_mode import EncryptModeCalculator
 from federatedml.util import consts
@@ -36,11 +39,25 @@ from federatedml.transfer_variable.transfer_class.hetero_boosting_transfer_varia
 from federatedml.util.io_check import assert_io_num_rows_equal
 
 
+# lower-cased encrypt method -> (encrypter class, extra arguments of generate_key)
+ENCRYPTER_REGISTRY = {
+    consts.PAILLIER.lower(): (PaillierEncrypt, {}),
+    consts.ITERATIVEAFFINE.lower(): (IterativeAffineEncrypt, {'randomized': False}),
+    consts.RANDOM_ITERATIVEAFFINE.lower(): (IterativeAffineEncrypt, {'randomized': True}),
+    consts.IPCL.lower(): (IpclPaillierEncrypt, {}),
+}
+
+
+# number of rounds whose loss metrics are sent in one callback
+LOSS_METRIC_FLUSH_ROUNDS = 10
+
+
 class HeteroBoosting(Boosting, ABC):
 
     def __init__(self):
         super(HeteroBoosting, self).__init__()
         self.encrypter = None
+        self.default_encrypt_method = False
         self.encrypted_calculator = None
         self.early_stopping_rounds = None
         self.binning_class = QuantileBinning
@@ -52,6 +69,10 @@ class HeteroBoosting(Boosting, ABC):
         LOGGER.debug('in hetero boosting, objective param is {}'.format(param.objective_param.objective))
         super(HeteroBoosting, self)._init_model(param)
         self.encrypt_param = param.encrypt_param
+        # IterativeAffine is used if encrypt method is not set
+        self.default_encrypt_method = self.encrypt_param.method is None
+        if self.default_encrypt_method:
+            self.encrypt_param.method = consts.ITERATIVEAFFINE
         self.re_encrypt_rate = param.encrypted_mode_calculator_param
         self.calculated_mode = param.encrypted_mode_calculator_param.mode
         self.re_encrypted_rate = param.encrypted_mode_calculator_param.re_encrypted_rate
@@ -60,20 +81,25 @@ class HeteroBoosting(Boosting, ABC):
 
     def generate_encrypter(self):
         LOGGER.info("generate encrypter")
-        if self.encrypt_param.method.lower() == consts.PAILLIER.lower():
-            self.encrypter = PaillierEncrypt()
-            self.encrypter.generate_key(self.encrypt_param.key_length)
-        elif self.encrypt_param.method.lower() == consts.ITERATIVEAFFINE.lower():
-            self.encrypter = IterativeAffineEncrypt()
-            self.encrypter.generate_key(key_size=self.encrypt_param.key_length,
-                                        randomized=False)
-        elif self.encrypt_param.method.lower() == consts.RANDOM_ITERATIVEAFFINE.lower():
-            self.encrypter = IterativeAffineEncrypt()
-            self.encrypter.generate_key(key_size=self.encrypt_param.key_length,
-                                        randomized=True)
-        else:
+        method = self.encrypt_param.method.lower()
+        if method not in ENCRYPTER_REGISTRY:
             raise NotImplementedError("encrypt method not supported yes!!!")
 
+        if method == consts.PAILLIER.lower() and self.role == consts.GUEST and \
+                len(self.component_properties.host_party_idlist) == 1:
+            LOGGER.warning('Paillier is used in two-party hetero boosting, IterativeAffine is much cheaper '
+                           'and is recommended when only guest holds the key')
+
+        if self.default_encrypt_method and self.role == consts.GUEST:
+            # default encrypt method of hetero boosting changed from Paillier to IterativeAffine
+            LOGGER.warning('encrypt method is not set, IterativeAffine is used to encrypt gradients and hessians, '
+                           'it is not a standard homomorphic encryption scheme, set encrypt_param.method to '
+                           '"Paillier" to use Paillier as in previous versions')
+
+        encrypter_class, key_kwargs = ENCRYPTER_REGISTRY[method]
+        self.encrypter = encrypter_class()
+        self.encrypter.generate_key(self.encrypt_param.key_length, **key_kwargs)
+
         self.encrypted_calculator = EncryptModeCalculator(self.encrypter, self.calculated_mode, self.re_encrypted_rate)
 
     def check_label(self):
@@ -86,27 +112,63 @@ class HeteroBoosting(Boosting, ABC):
             if num_classes > 2:
                 booster_dim = num_classes
 
-            range_from_zero = True
-            for _class in classes_:
-                try:
-                    if 0 <= _class < len(classes_) and isinstance(_class, int):
-                        continue
-                    else:
-                        range_from_zero = False
-                        break
-                except:
-                    range_from_zero = False
-
-            classes_ = sorted(classes_)
-            if not range_from_zero:
-                class_mapping = dict(zip(classes_, range(num_classes)))
-                self.y = self.y.mapValues(lambda _class: class_mapping[_class])
+            # classes_ are distinct, so they are 0 ... num_classes - 1 if all of them are integers in this range
+            range_from_zero = len(classes_) > 0 and \
+                all(isinstance(_class, int) and 0 <= _class < num_classes for _class in classes_)
+
+            if range_from_zero:
+                # sorted distinct labels are exactly 0 ... num_classes - 1, no need to sort
+                classes_ = list(range(num_classes))
+            else:
+                classes_ = sorted(classes_)
+                if all(isinstance(_class, int) for _class in classes_) and \
+                        0 <= classes_[0] and classes_[-1] < consts.MAX_CLASSNUM:
+                    # small non-negative integer labels are remapped by a numpy gather per partition
+                    label_lookup = np.full(classes_[-1] + 1, -1, dtype=np.int64)
+                    label_lookup[classes_] = np.arange(num_classes)
+                    remap_func = functools.partial(self.remap_label_partition, label_lookup=label_lookup)
+                    self.y = self.y.mapPartitions(remap_func, use_previous_behavior=False,
+                                                  preserves_partitioning=True)
+                else:
+                    class_mapping = dict(zip(classes_, range(num_classes)))
+                    self.y = self.y.mapValues(lambda _class: class_mapping[_class])
 
         else:
             RegressionLabelChecker.validate_label(self.data_bin)
 
         return classes_, num_classes, booster_dim
 
+    @staticmethod
+    def remap_label_partition(kv_iterator, label_lookup):
+        keys, labels = [], []
+        for key, label in kv_iterator:
+            keys.append(key)
+            labels.append(label)
+
+        return list(zip(keys, label_lookup[np.array(labels, dtype=np.int64)].tolist()))
+
+    def fit_boosters(self, epoch_idx):
+        """
+        fit boosters of all classes in an epoch, boosters are returned in class index order
+        """
+        # boosters are fitted one by one: flowid of trees sets the global federation tag namespace,
+        # and encrypted calculator, feature subsampling random state are shared by all classes
+        return [self.fit_a_booster(epoch_idx, class_idx) for class_idx in range(self.booster_dim)]
+
+    def update_boosting_model_list(self, models):
+        """
+        add params of boosters fitted in an epoch to boosting_model_list, boosting_model_list only holds
+        finished boosters, as validation predicts with it during training
+        """
+        booster_params = []
+        for model in models:
+            booster_meta, booster_param = model.get_model()
+            if booster_meta is not None and booster_param is not None:
+                self.booster_meta = booster_meta
+                booster_params.append(booster_param)
+
+        self.boosting_model_list.extend(booster_params)
+
 
 class HeteroBoostingGuest(HeteroBoosting, ABC):
 
@@ -119,6 +181,8 @@ class HeteroBoostingGuest(HeteroBoosting, ABC):
     def sync_booster_dim(self):
         LOGGER.info("sync booster_dim to host")
 
+        # booster_dim depends on the number of classes in labels, which only guest holds, so it can not be
+        # derived from params on host and is always synced
         self.transfer_variable.booster_dim.remote(self.booster_dim,
                                                   role=consts.HOST,
                                                   idx=-1)
@@ -163,50 +227,55 @@ class HeteroBoostingGuest(HeteroBoosting, ABC):
 
         self.validation_strategy = self.init_validation_strategy(data_inst, validate_data)
 
-        for epoch_idx in range(self.boosting_round):
-
-            LOGGER.info('cur epoch idx is {}'.format(epoch_idx))
+        # loss metrics are sent every LOSS_METRIC_FLUSH_ROUNDS rounds, the rest are sent when training ends or fails
+        metric_buffer = []
+        try:
+            for epoch_idx in range(self.boosting_round):
 
-            for class_idx in range(self.booster_dim):
+                LOGGER.info('cur epoch idx is {}'.format(epoch_idx))
 
-                # fit a booster
-                model = self.fit_a_booster(epoch_idx, class_idx)
+                self.encrypted_calculator.set_round(epoch_idx)
 
-                booster_meta, booster_param = model.get_model()
+                # fit boosters
+                models = self.fit_boosters(epoch_idx)
 
-                if booster_meta is not None and booster_param is not None:
-                    self.booster_meta = booster_meta
-                    self.boosting_model_list.append(booster_param)
+                self.update_boosting_model_list(models)
 
                 # update predict score
-                cur_sample_weights = model.get_sample_weights()
-                self.y_hat = self.get_new_predict_score(self.y_hat, cur_sample_weights, dim=class_idx)
-
-            # compute loss
-            loss = self.compute_loss(self.y_hat, self.y)
-            self.history_loss.append(loss)
-            LOGGER.info("round {} loss is {}".format(epoch_idx, loss))
-            self.callback_metric("loss",
-                                 "train",
-                                 [Metric(epoch_idx, loss)])
-
-            if self.validation_strategy:
-                self.validation_strategy.validate(self, epoch_idx, use_precomputed_train=True,
-                                                  train_scores=self.score_to_predict_result(data_inst, self.y_hat))
-
-            should_stop_a, should_stop_b = False, False
-            if self.validation_strategy is not None:
-                if self.validation_strategy.need_stop():
-                    should_stop_a = True
-
-            if self.n_iter_no_change and self.check_convergence(loss):
-                should_stop_b = True
-                self.is_converged = True
-
-            self.sync_stop_flag(self.is_converged, epoch_idx)
-
-            if should_stop_a or should_stop_b:
-                break
+                for class_idx, model in enumerate(models):
+                    self.y_hat = self.get_new_predict_score(self.y_hat, model.get_sample_weights(), dim=class_idx)
+
+                # compute loss
+                loss = self.compute_loss(self.y_hat, self.y)
+                self.history_loss.append(loss)
+                LOGGER.info("round {} loss is {}".format(epoch_idx, loss))
+                metric_buffer.append(Metric(epoch_idx, loss))
+                if len(metric_buffer) >= LOSS_METRIC_FLUSH_ROUNDS:
+                    self.callback_metric("loss", "train", metric_buffer)
+                    metric_buffer = []
+
+                # validation exports the model with history loss, so it runs after loss is recorded
+                if self.validation_strategy:
+                    self.validation_strategy.validate(self, epoch_idx, use_precomputed_train=True,
+                                                      train_scores=self.score_to_predict_result(data_inst, self.y_hat))
+
+                should_stop_a, should_stop_b = False, False
+                if self.validation_strategy is not None:
+                    if self.validation_strategy.need_stop():
+                        should_stop_a = True
+
+                if self.n_iter_no_change and self.check_convergence(loss):
+                    should_stop_b = True
+                    self.is_converged = True
+
+                if self.n_iter_no_change:
+                    self.sync_stop_flag(self.is_converged, epoch_idx)
+
+                if should_stop_a or should_stop_b:
+                    break
+        finally:
+            if metric_buffer:
+                self.callback_metric("loss", "train", metric_buffer)
 
         self.callback_meta("loss",
                            "train",
@@ -287,13 +356,10 @@ class HeteroBoostingHost(HeteroBoosting, ABC):
 
             LOGGER.info('cur epoch idx is {}'.format(epoch_idx))
 
-            for class_idx in range(self.booster_dim):
-                # fit a booster
-                model = self.fit_a_booster(epoch_idx, class_idx)  # need to implement
-                booster_meta, booster_param = model.get_model()
-                if booster_meta is not None and booster_param is not None:
-                    self.booster_meta = booster_meta
-                    self.boosting_model_list.append(booster_param)
+            # fit boosters
+            models = self.fit_boosters(epoch_idx)
+
+            self.update_boosting_model_list(models)
 
             if self.validation_strategy:
                 self.validation_strategy.validate(self, epoch_idx, use_precomputed_train=True, train_scores=None)
@@ -303,7 +369,8 @@ class HeteroBoostingHost(HeteroBoosting, ABC):
                 if self.validation_strategy.need_stop():
                     should_stop_a = True
 
-            should_stop_b = self.sync_stop_flag(epoch_idx)
+            # n_iter_no_change is set on both parties, guest sends stop flags only when it is True
+            should_stop_b = self.sync_stop_flag(epoch_idx) if self.n_iter_no_change else False
             self.is_converged = should_stop_b
             if should_stop_a or should_stop_b:
                 break
@@ -324,12 +391,11 @@ class HeteroBoostingHost(HeteroBoosting, ABC):
         rounds = len(self.boosting_model_list) // self.booster_dim
         predict_start_round = self.sync_predict_start_round()
 
-        for idx in range(predict_start_round, rounds):
-            for booster_idx in range(self.booster_dim):
-                model = self.load_booster(self.booster_meta,
-                                          self.boosting_model_list[idx * self.booster_dim + booster_idx],
-                                          idx, booster_idx)
-                model.predict(data_inst)
+        start_idx, end_idx = predict_start_round * self.booster_dim, rounds * self.booster_dim
+        for model_idx, booster_param in enumerate(self.boosting_model_list[start_idx: end_idx], start_idx):
+            idx, booster_idx = divmod(model_idx, self.booster_dim)
+            model = self.load_booster(self.booster_meta, booster_param, idx, booster_idx)
+            model.predict(data_inst)
 
         LOGGER.debug('lazy prediction finished')
 
@@ -11,6 +11,7 @@ from federatedml.protobuf.generated.boosting_tree_model_param_pb2 import Feature
 from federatedml.ensemble.boosting.boosting_core import HeteroBoostingGuest
 from federatedml.param.boosting_param import HeteroSecureBoostParam
 from federatedml.ensemble.basic_algorithms import HeteroDecisionTreeGuest
+from federatedml.ensemble.basic_algorithms.decision_tree.tree_core.packed_encoder import PackedEncoder
 from federatedml.util import consts
 from federatedml.transfer_variable.transfer_class.hetero_secure_boosting_predict_transfer_variable import \
     HeteroSecureBoostTransferVariable
@@ -31,6 +32,8 @@ class HeteroSecureBoostingTreeGuest(HeteroBoostingGuest):
         self.feature_importances_ = {}
         self.model_param = HeteroSecureBoostParam()
         self.complete_secure = False
+        self.gh_pack = False
+        self.quant_bits = 16
         self.data_alignment_map = {}
         self.predict_transfer_inst = HeteroSecureBoostTransferVariable()
         self.model_name = 'HeteroSecureBoost'
@@ -42,6 +45,8 @@ class HeteroSecureBoostingTreeGuest(HeteroBoostingGuest):
         self.use_missing = param.use_missing
         self.zero_as_missing = param.zero_as_missing
         self.complete_secure = param.complete_secure
+        self.gh_pack = param.gh_pack
+        self.quant_bits = param.quant_bits
 
         if self.use_missing:
             self.tree_param.use_missing = self.use_missing
@@ -96,6 +101,9 @@ class HeteroSecureBoostingTreeGuest(HeteroBoostingGuest):
         if self.cur_epoch_idx == 0 and self.complete_secure:
             tree.set_as_complete_secure_tree()
 
+        if self.gh_pack:
+            tree.set_gh_packer(PackedEncoder.from_grad_and_hess(g_h, self.quant_bits))
+
         tree.fit()
 
         self.update_feature_importance(tree.get_feature_importance())
@@ -310,13 +318,12 @@ class HeteroSecureBoostingTreeGuest(HeteroBoostingGuest):
         self.sync_predict_round(last_round + 1)
 
         rounds = len(self.boosting_model_list) // self.booster_dim
+        start_idx, end_idx = (last_round + 1) * self.booster_dim, rounds * self.booster_dim
         trees = []
-        for idx in range(last_round + 1, rounds):
-            for booster_idx in range(self.booster_dim):
-                tree = self.load_booster(self.booster_meta,
-                                         self.boosting_model_list[idx * self.booster_dim + booster_idx],
-                                         idx, booster_idx)
-                trees.append(tree)
+        for model_idx, booster_param in enumerate(self.boosting_model_list[start_idx: end_idx], start_idx):
+            idx, booster_idx = divmod(model_idx, self.booster_dim)
+            tree = self.load_booster(self.booster_meta, booster_param, idx, booster_idx)
+            trees.append(tree)
 
         predict_cache = None
         if last_round != -1:
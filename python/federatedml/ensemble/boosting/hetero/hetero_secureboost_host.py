@@ -186,13 +186,12 @@ class HeteroSecureBoostingTreeHost(HeteroBoostingHost):
         predict_start_round = self.sync_predict_start_round()
 
         rounds = len(self.boosting_model_list) // self.booster_dim
+        start_idx, end_idx = predict_start_round * self.booster_dim, rounds * self.booster_dim
         trees = []
-        for idx in range(predict_start_round, rounds):
-            for booster_idx in range(self.booster_dim):
-                tree = self.load_booster(self.booster_meta,
-                                         self.boosting_model_list[idx * self.booster_dim + booster_idx],
-                                         idx, booster_idx)
-                trees.append(tree)
+        for model_idx, booster_param in enumerate(self.boosting_model_list[start_idx: end_idx], start_idx):
+            idx, booster_idx = divmod(model_idx, self.booster_dim)
+            tree = self.load_booster(self.booster_meta, booster_param, idx, booster_idx)
+            trees.append(tree)
 
         self.boosting_fast_predict(processed_data, trees=trees)
 
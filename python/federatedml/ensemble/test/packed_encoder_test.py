@@ -0,0 +1,52 @@
+#
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+
+import unittest
+
+import numpy as np
+from federatedml.ensemble.basic_algorithms.decision_tree.tree_core.packed_encoder import PackedEncoder
+
+
+class TestPackedEncoder(unittest.TestCase):
+
+    def setUp(self):
+        np.random.seed(0)
+        self.grad = np.random.uniform(-1, 1, 1000)
+        self.hess = np.random.uniform(0, 0.25, 1000)
+        self.encoder = PackedEncoder(g_max=np.abs(self.grad).max(), h_max=self.hess.max(),
+                                     sample_num=len(self.grad), quant_bits=16)
+
+    def test_pack_unpack(self):
+        for g, h in zip(self.grad, self.hess):
+            g_, h_ = self.encoder.unpack(self.encoder.pack((g, h)))
+            self.assertTrue(np.fabs(g - g_) < 1e-4)
+            self.assertTrue(np.fabs(h - h_) < 1e-5)
+
+    def test_sum_of_packed(self):
+        packed = [self.encoder.pack((g, h)) for g, h in zip(self.grad, self.hess)]
+        for end in [1, 10, 500, 1000]:
+            g_sum, h_sum = self.encoder.unpack(sum(packed[:end]))
+            self.assertTrue(np.fabs(g_sum - self.grad[:end].sum()) < end * 1e-4)
+            self.assertTrue(np.fabs(h_sum - self.hess[:end].sum()) < end * 1e-5)
+
+        # subtraction of sums, as is done by host for sparse points
+        g_diff, h_diff = self.encoder.unpack(sum(packed) - sum(packed[:300]))
+        self.assertTrue(np.fabs(g_diff - self.grad[300:].sum()) < 0.1)
+        self.assertTrue(np.fabs(h_diff - self.hess[300:].sum()) < 0.01)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -78,14 +78,11 @@ class DaviesBouldinIndex(object):
     def compute(self, dist_table, cluster_dist):
         if len(dist_table) == 1:
             return np.nan
-        max_dij_list = []
-        d = 0
-        for i in range(0, len(dist_table)):
-            dij_list = []
-            for j in range(0, len(dist_table)):
-                if j != i:
-                    dij_list.append((dist_table[i] + dist_table[j]) / (cluster_dist[d] ** 0.5))
-                    d += 1
-            max_dij = max(dij_list)
-            max_dij_list.append(max_dij)
-        return np.sum(max_dij_list) / len(dist_table)
+        # cluster_dist holds squared distances of centroid pairs (i, j), i != j, in row-major order
+        k = len(dist_table)
+        intra_dist = np.asarray(dist_table, dtype=np.float64)
+        off_diagonal = ~np.eye(k, dtype=bool)
+        pair_intra_dist = (intra_dist[:, np.newaxis] + intra_dist[np.newaxis, :])[off_diagonal].reshape(k, k - 1)
+        centroid_dist = np.sqrt(np.asarray(cluster_dist[:k * (k - 1)], dtype=np.float64)).reshape(k, k - 1)
+        max_dij_list = np.max(pair_intra_dist / centroid_dist, axis=1)
+        return np.sum(max_dij_list) / k
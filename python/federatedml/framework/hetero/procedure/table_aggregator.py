@@ -84,10 +84,13 @@ class Server(secure_sum_aggregator.Server, secure_mean_aggregator.Server):
         self._table_sync = TableTransferServer()
 
     def aggregate_tables(self, suffix=tuple()):
+        """
+        sum tables of all clients by key, values are numpy arrays (or numbers) and are added by np.add
+        """
         tables = self._table_sync.get_tables(suffix=suffix)
         result = tables[0]
         for table in tables[1:]:
-            result = result.join(table, lambda x1, x2: x1 + x2)
+            result = result.join(table, np.add)
         # LOGGER.debug(f"aggregate_result: {list(result.collect())[0]}")
         return result
 
@@ -16,6 +16,7 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 #
+import functools
 import numpy as np
 from federatedml.util import LOGGER
 from fate_arch.session import computing_session
@@ -140,6 +141,20 @@ class PaillierTensor(object):
     def reduce_sum(self):
         return self._obj.reduce(lambda t1, t2: t1 + t2)
 
+    @staticmethod
+    def _add_by_index(kv_iters, arr):
+        return [(k, v + arr[k]) for k, v in kv_iters]
+
+    def add_by_index(self, arr):
+        """
+        add arr[k] to value of key k, keys of tensor index the first dim of arr.
+        arr is added in partitions of tensor directly, no table is built and joined for it
+        """
+        add_func = functools.partial(self._add_by_index, arr=arr)
+        return PaillierTensor(tb_obj=self._obj.mapPartitions(add_func,
+                                                             use_previous_behavior=False,
+                                                             preserves_partitioning=True))
+
     def map_ndarray_product(self, other):
         if isinstance(other, np.ndarray):
             return PaillierTensor(tb_obj=self._obj.mapValues(lambda val: val * other))
@@ -163,7 +178,7 @@ class PaillierTensor(object):
         return PaillierTensor(tb_obj=encrypt_tool.encrypt(self._obj))
 
     def decrypt(self, decrypt_tool):
-        return PaillierTensor(tb_obj=self._obj.mapValues(lambda val: decrypt_tool.recursive_decrypt(val)))
+        return PaillierTensor(tb_obj=decrypt_tool.distribute_decrypt(self._obj))
 
     @staticmethod
     def _vector_mul(kv_iters):
@@ -17,6 +17,22 @@ class TestRandomNumberGenerator(unittest.TestCase):
 
         self.assertTrue(random_data.shape == data.shape)
 
+        random_data = self.rng_gen.generate_random_number((100, 50))
+        self.assertTrue(random_data.dtype == np.float64)
+        self.assertTrue(random_data.min() >= self.rng_gen.lower_bound)
+        self.assertTrue(random_data.max() < self.rng_gen.upper_bound)
+        self.assertTrue(len(np.unique(random_data)) == random_data.size)
+
+    def test_key_stream(self):
+        first_bytes = self.rng_gen.random_bytes(64)
+        self.assertEqual(len(first_bytes), 64)
+        self.assertNotEqual(first_bytes, self.rng_gen.random_bytes(64))
+
+        self.rng_gen.reseed()
+        random_data = self.rng_gen.generate_random_number((10, 10))
+        self.assertTrue(random_data.min() >= self.rng_gen.lower_bound)
+        self.assertTrue(random_data.max() < self.rng_gen.upper_bound)
+
     def test_fast_generate_random_number(self):
         data = np.ones((1000, 100))
 
@@ -17,20 +17,24 @@
 #  limitations under the License.
 #
 
-import random
+import os
 
 import numpy as np
+from Cryptodome.Cipher import AES
 
 from fate_arch.session import computing_session
 from federatedml.nn.hetero_nn.backend.paillier_tensor import PaillierTensor
 
 BITS = 10
+STREAM_KEY_SIZE = 32
+STREAM_NONCE_SIZE = 8
 
 
 class RandomNumberGenerator(object):
     def __init__(self):
         self.lower_bound = -2 ** BITS
         self.upper_bound = 2 ** BITS
+        self._stream = None
 
     @staticmethod
     def get_size_by_shape(shape):
@@ -40,14 +44,44 @@ class RandomNumberGenerator(object):
 
         return size
 
+    def reseed(self):
+        """
+        start a new AES-CTR key stream with a fresh key from os.urandom
+        """
+        self._stream = AES.new(os.urandom(STREAM_KEY_SIZE), AES.MODE_CTR, nonce=os.urandom(STREAM_NONCE_SIZE))
+
+    def random_bytes(self, n_bytes):
+        """
+        pull n_bytes bytes from the AES-CTR key stream, key stream is seeded from os.urandom once,
+        each call continues the counter, so no bytes are reused
+        """
+        if self._stream is None:
+            self.reseed()
+        return self._stream.encrypt(bytes(n_bytes))
+
+    @staticmethod
+    def bytes_to_uniform(random_bytes, lower_bound, upper_bound, shape):
+        # 53 random bits per number, same as random.SystemRandom().random()
+        random_bits = np.frombuffer(random_bytes, dtype=np.uint64) >> np.uint64(11)
+        uniform = random_bits * (1.0 / (1 << 53))
+        return np.reshape(lower_bound + (upper_bound - lower_bound) * uniform, shape)
+
     def generate_random_number(self, shape):
+        """
+        generate uniform random numbers in [lower_bound, upper_bound) from the AES-CTR key stream,
+        all numbers of shape are generated by numpy at once
+        """
         size = self.get_size_by_shape(shape)
-        return np.reshape([random.SystemRandom().uniform(self.lower_bound, self.upper_bound) for _ in range(size)],
-                          shape)
+        return self.bytes_to_uniform(self.random_bytes(8 * size), self.lower_bound, self.upper_bound, shape)
 
     def fast_generate_random_number(self, shape, partition=10):
         tb = computing_session.parallelize([None for _ in range(shape[0])], include_key=False, partition=partition)
 
-        tb = tb.mapValues(lambda val: self.generate_random_number(shape[1:]))
+        # key stream is not shipped to workers, each row draws its own bytes from os.urandom
+        lower_bound, upper_bound = self.lower_bound, self.upper_bound
+        row_shape = shape[1:]
+        row_bytes = 8 * self.get_size_by_shape(row_shape)
+        tb = tb.mapValues(lambda val: RandomNumberGenerator.bytes_to_uniform(os.urandom(row_bytes),
+                                                                             lower_bound, upper_bound, row_shape))
 
         return PaillierTensor(tb_obj=tb)
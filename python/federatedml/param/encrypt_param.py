@@ -30,7 +30,9 @@ class EncryptParam(BaseParam):
         If method is 'Paillier', Paillier encryption will be used for federated ml.
         To use non-encryption version in HomoLR, set this to None.
         For detail of Paillier encryption, please check out the paper mentioned in README file.
-        Accepted values: {'Paillier', 'IterativeAffine', 'Random_IterativeAffine'}
+        If method is 'IPCL', Paillier encryption backed by Intel Paillier Cryptosystem Library will be used,
+        which requires ipcl_python to be installed.
+        Accepted values: {'Paillier', 'IterativeAffine', 'Random_IterativeAffine', 'IPCL'}
 
     key_length : int, default: 1024
         Used to specify the length of key in this encryption method.
@@ -57,6 +59,8 @@ class EncryptParam(BaseParam):
                 self.method = consts.ITERATIVEAFFINE
             elif user_input == "randomiterativeaffine":
                 self.method = consts.RANDOM_ITERATIVEAFFINE
+            elif user_input == "ipcl":
+                self.method = consts.IPCL
             else:
                 raise ValueError(
                     "encrypt_param's method {} not supported".format(user_input))
@@ -65,8 +65,38 @@ class Encrypt(object):
         result = [self.decrypt(msg) for msg in values]
         return result
 
+    def encrypt_batch(self, values):
+        """
+        encrypt a batch(list or 1-D ndarray) of numbers, return a list of ciphertexts
+        """
+        encrypt = self.encrypt
+        return [encrypt(value) for value in values]
+
+    def decrypt_batch(self, values):
+        """
+        decrypt a batch(list or 1-D ndarray) of ciphertexts, return a list of plaintexts
+        """
+        decrypt = self.decrypt
+        return [decrypt(value) for value in values]
+
+    @staticmethod
+    def _decrypt_partition(kv_iterator, cipher):
+        keys, values = [], []
+        for key, value in kv_iterator:
+            keys.append(key)
+            values.append(value)
+
+        return list(zip(keys, cipher.recursive_decrypt_list(values)))
+
     def distribute_decrypt(self, X):
-        decrypt_table = X.mapValues(lambda x: self.decrypt(x))
+        """
+        decrypt (nested) values of a table partition by partition, ciphertexts of a partition are decrypted
+        by one decrypt_batch call
+        """
+        decrypt_func = functools.partial(self._decrypt_partition, cipher=self)
+        decrypt_table = X.mapPartitions(decrypt_func,
+                                        use_previous_behavior=False,
+                                        preserves_partitioning=True)
         return decrypt_table
 
     def distribute_encrypt(self, X):
@@ -91,6 +121,26 @@ class Encrypt(object):
     def recursive_decrypt(self, X):
         return self._recursive_func(X, self.decrypt)
 
+    def recursive_encrypt_list(self, values):
+        """
+        encrypt all numbers of a list of (nested) values with one encrypt_batch call
+        """
+        plaintexts = []
+        for value in values:
+            self._recursive_func(value, plaintexts.append)
+        ciphertexts = iter(self.encrypt_batch(plaintexts))
+        return [self._recursive_func(value, lambda val: next(ciphertexts)) for value in values]
+
+    def recursive_decrypt_list(self, values):
+        """
+        decrypt all ciphertexts of a list of (nested) values with one decrypt_batch call
+        """
+        ciphertexts = []
+        for value in values:
+            self._recursive_func(value, ciphertexts.append)
+        plaintexts = iter(self.decrypt_batch(ciphertexts))
+        return [self._recursive_func(value, lambda val: next(plaintexts)) for value in values]
+
 
 class RsaEncrypt(Encrypt):
     def __init__(self):
@@ -171,6 +221,72 @@ class PaillierEncrypt(Encrypt):
         else:
             return None
 
+    def decrypt_batch(self, values):
+        if self.privacy_key is None:
+            return [None] * len(values)
+        decrypt = self.privacy_key.decrypt
+        return [decrypt(value) for value in values]
+
+
+class IpclPaillierEncrypt(Encrypt):
+    """
+    Paillier encryption backed by Intel Paillier Cryptosystem Library (ipcl_python).
+    IPCL runs modular exponentiations 8 at a time with AVX512-IFMA when the cpu supports it,
+    so values should be encrypted in batches through encrypt_batch/recursive_encrypt_list.
+    """
+
+    def __init__(self):
+        super(IpclPaillierEncrypt, self).__init__()
+
+    def generate_key(self, n_length=1024):
+        from ipcl_python import PaillierKeypair as IpclPaillierKeypair
+        self.public_key, self.privacy_key = \
+            IpclPaillierKeypair.generate_keypair(n_length)
+
+    def get_key_pair(self):
+        return self.public_key, self.privacy_key
+
+    def set_public_key(self, public_key):
+        self.public_key = public_key
+
+    def get_public_key(self):
+        return self.public_key
+
+    def set_privacy_key(self, privacy_key):
+        self.privacy_key = privacy_key
+
+    def get_privacy_key(self):
+        return self.privacy_key
+
+    def encrypt(self, value):
+        if self.public_key is not None:
+            return self.public_key.encrypt(value)
+        else:
+            return None
+
+    def decrypt(self, value):
+        if self.privacy_key is not None:
+            decrypt_value = self.privacy_key.decrypt(value)
+            if isinstance(decrypt_value, np.ndarray) and decrypt_value.size == 1:
+                return decrypt_value.item()
+            return decrypt_value
+        else:
+            return None
+
+    def encrypt_batch(self, values):
+        if self.public_key is None:
+            return [None] * len(values)
+        if len(values) == 0:
+            return []
+        ciphertext = self.public_key.encrypt(np.asarray(values, dtype=np.float64))
+        return [ciphertext[i] for i in range(len(values))]
+
+    def encrypt_list(self, values):
+        return self.encrypt_batch(values)
+
+    def recursive_encrypt(self, X):
+        return self.recursive_encrypt_list([X])[0]
+
 
 class FakeEncrypt(Encrypt):
     def encrypt(self, value):
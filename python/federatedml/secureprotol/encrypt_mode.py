@@ -14,11 +14,13 @@
 #  limitations under the License.
 #
 
+import functools
 import random
 from collections import Iterable
 
 import numpy as np
 
+from federatedml.util import LOGGER
 from federatedml.util import consts
 
 
@@ -34,7 +36,8 @@ class EncryptModeCalculator(object):
           'strict': means that re-encrypted every function call.
           'fast/confusion_opt": one record use only on confusion in encryption once during iteration.
           'balance/confusion_opt_balance":  balance of 'confusion_opt', will use new confusion according to probability
-                                    decides by 're_encrypted_rate'
+                                    decides by 're_encrypted_rate'. If training round is given by set_round,
+                                    new confusion is used every ceil(1 / re_encrypted_rate) rounds instead.
     re_encrypted_rate: float or float, numeric, use if mode equals to "balance" or "confusion_opt_balance"
 
     """
@@ -46,6 +49,10 @@ class EncryptModeCalculator(object):
         self.prev_data = None
         self.prev_encrypted_data = None
         self.enc_zeros = None
+        self.round_idx = None
+        self.enc_zeros_round = None
+        self.encrypt_num = 0
+        self.enc_zeros_reuse_num = 0
 
         self.soft_link_mode()
 
@@ -74,8 +81,59 @@ class EncryptModeCalculator(object):
     def gen_random_number():
         return random.random()
 
+    def set_round(self, round_idx):
+        self.round_idx = round_idx
+
     def should_re_encrypted(self):
-        return self.gen_random_number() <= self.re_encrypted_rate + consts.FLOAT_ZERO
+        if self.round_idx is None:
+            return self.gen_random_number() <= self.re_encrypted_rate + consts.FLOAT_ZERO
+
+        # confusion is re-generated at most once per round
+        if self.round_idx == self.enc_zeros_round or self.re_encrypted_rate <= consts.FLOAT_ZERO:
+            return False
+
+        re_encrypt_interval = max(1, int(np.ceil(1 / self.re_encrypted_rate - consts.FLOAT_ZERO)))
+        return self.round_idx % re_encrypt_interval == 0
+
+    @staticmethod
+    def encrypt_partition(kv_iterator, encrypter, buffer_size=consts.ENCRYPT_BUFFER_SIZE):
+        """
+        Generator encrypting (key, value) pairs of a partition, values are buffered and encrypted
+        by one encrypt_batch call every time the buffer is full
+        """
+        keys, values = [], []
+        for key, value in kv_iterator:
+            keys.append(key)
+            values.append(value)
+            if len(values) == buffer_size:
+                yield from zip(keys, encrypter.recursive_encrypt_list(values))
+                keys, values = [], []
+
+        if values:
+            yield from zip(keys, encrypter.recursive_encrypt_list(values))
+
+    @staticmethod
+    def batch_encrypt_partition(kv_iterator, encrypter):
+        # some computing backends move the partition cursor once func returns, consume the generator here
+        return list(EncryptModeCalculator.encrypt_partition(kv_iterator, encrypter))
+
+    def encrypt_table(self, input_data):
+        """
+        Encrypt values of a DTable partition by partition, each partition is encrypted by one
+        encrypt_batch call of encrypter instead of element by element
+
+        Parameters
+        ----------
+        input_data: DTable
+
+        Returns
+        -------
+        new_data: DTable, encrypted result of input_data
+        """
+        batch_encrypt_func = functools.partial(self.batch_encrypt_partition, encrypter=self.encrypter)
+        return input_data.mapPartitions(batch_encrypt_func,
+                                        use_previous_behavior=False,
+                                        preserves_partitioning=True)
 
     def encrypt(self, input_data):
         """
@@ -91,13 +149,20 @@ class EncryptModeCalculator(object):
 
         """
         if self.mode == "strict":
-            new_data = input_data.mapValues(self.encrypter.recursive_encrypt)
+            new_data = self.encrypt_table(input_data)
             return new_data
         else:
             if self.enc_zeros is None or (
                 self.mode == "balance" and self.should_re_encrypted()) \
                     or self.enc_zeros.count() != input_data.count():
-                self.enc_zeros = input_data.mapValues(lambda val: self.encrypter.encrypt(0))
+                self.enc_zeros = self.encrypt_table(input_data.mapValues(lambda val: 0))
+                self.enc_zeros_round = self.round_idx
+            else:
+                self.enc_zeros_reuse_num += 1
+
+            self.encrypt_num += 1
+            LOGGER.debug("encrypted zeros are reused {} of {} encryptions".format(self.enc_zeros_reuse_num,
+                                                                                  self.encrypt_num))
 
             new_data = input_data.join(self.enc_zeros, self.add_enc_zero)
             return new_data
@@ -123,6 +123,8 @@ class PaillierPrivateKey(object):
             self.q = q
         self.psquare = self.p * self.p
         self.qsquare = self.q * self.q
+        self.p_minus_one = self.p - 1
+        self.q_minus_one = self.q - 1
         self.q_inverse = gmpy_math.invert(self.q, self.p)
         self.hp = self.h_func(self.p, self.psquare)
         self.hq = self.h_func(self.q, self.qsquare)
@@ -167,11 +169,11 @@ class PaillierPrivateKey(object):
                 type(ciphertext))
 
         mp = self.l_func(gmpy_math.powmod(ciphertext,
-                                              self.p-1, self.psquare),
+                                              self.p_minus_one, self.psquare),
                                               self.p) * self.hp % self.p
 
         mq = self.l_func(gmpy_math.powmod(ciphertext,
-                                              self.q-1, self.qsquare),
+                                              self.q_minus_one, self.qsquare),
                                               self.q) * self.hq % self.q
 
         return self.crt(mp, mq)
@@ -199,6 +201,9 @@ class PaillierPrivateKey(object):
 class PaillierEncryptedNumber(object):
     """Represents the Paillier encryption of a float or int.
     """
+    # no per-object __dict__, lots of encrypted numbers are held in object ndarrays and tables
+    __slots__ = ('public_key', '__ciphertext', 'exponent', '__is_obfuscator')
+
     def __init__(self, public_key, ciphertext, exponent=0):
         self.public_key = public_key
         self.__ciphertext = ciphertext
@@ -211,6 +216,17 @@ class PaillierEncryptedNumber(object):
         if not isinstance(self.public_key, PaillierPublicKey):
             raise TypeError("public_key should be a PaillierPublicKey, not: %s" % type(self.public_key))
 
+    def __getstate__(self):
+        # pickled as a plain tuple instead of an attribute dict
+        return self.public_key, self.__ciphertext, self.exponent, self.__is_obfuscator
+
+    def __setstate__(self, state):
+        if isinstance(state, dict):
+            # pickled by versions without __slots__
+            state = (state['public_key'], state['_PaillierEncryptedNumber__ciphertext'], state['exponent'],
+                     state['_PaillierEncryptedNumber__is_obfuscator'])
+        self.public_key, self.__ciphertext, self.exponent, self.__is_obfuscator = state
+
     def ciphertext(self, be_secure=True):
         """return the ciphertext of the PaillierEncryptedNumber.
         """
@@ -84,5 +84,33 @@ class TestEncryptModeCalculator(unittest.TestCase):
                 self.assertTrue(np.fabs(self.numpy_data[j] - decrypt_data_i[j] + i).all() < 1e-5)
            
 
+    def test_encrypt_table(self):
+        from federatedml.secureprotol.encrypt_mode import EncryptModeCalculator
+        from federatedml.secureprotol import PaillierEncrypt
+        encrypter = PaillierEncrypt()
+        encrypter.generate_key(1024)
+        encrypted_calculator = EncryptModeCalculator(encrypter, "strict")
+
+        encrypted_data = encrypted_calculator.encrypt_table(self.data_tuple)
+        decrypt_data = dict(encrypted_data.mapValues(lambda val: encrypter.recursive_decrypt(val)).collect())
+        self.assertEqual(len(decrypt_data), len(self.tuple_data))
+        for key, value in decrypt_data.items():
+            self.assertTrue(isinstance(value, tuple))
+            self.assertTrue(np.fabs(np.array(value) - np.array(self.tuple_data[key])).max() < 1e-5)
+
+    def test_encrypt_partition(self):
+        from federatedml.secureprotol.encrypt_mode import EncryptModeCalculator
+        from federatedml.secureprotol import PaillierEncrypt
+        encrypter = PaillierEncrypt()
+        encrypter.generate_key(1024)
+
+        kvs = [(i, (i * 0.5, -i)) for i in range(7)]
+        encrypted_kvs = list(EncryptModeCalculator.encrypt_partition(iter(kvs), encrypter, buffer_size=3))
+        self.assertEqual([key for key, _ in encrypted_kvs], [key for key, _ in kvs])
+        for (_, encrypted_value), (_, value) in zip(encrypted_kvs, kvs):
+            self.assertTrue(np.fabs(np.array(encrypter.recursive_decrypt(encrypted_value)) - np.array(value)).max()
+                            < 1e-5)
+
+
 if __name__ == '__main__':
     unittest.main()
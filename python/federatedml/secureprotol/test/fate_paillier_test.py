@@ -14,6 +14,9 @@
 #  limitations under the License.
 #
 
+import copy
+import pickle
+
 import numpy as np
 import unittest
 from federatedml.secureprotol.fate_paillier import PaillierKeypair
@@ -80,6 +83,14 @@ class TestPaillierEncryptedNumber(unittest.TestCase):
             x = x + 5000 - 0.2
             de_en_x = self.private_key.decrypt(en_x)
             self.assertAlmostEqual(de_en_x, x)
+
+    def test_pickle(self):
+        en_x = self.public_key.encrypt(np.random.rand())
+        for new_en_x in [pickle.loads(pickle.dumps(en_x)), copy.deepcopy(en_x)]:
+            self.assertFalse(hasattr(new_en_x, '__dict__'))
+            self.assertEqual(new_en_x.exponent, en_x.exponent)
+            self.assertEqual(new_en_x.ciphertext(False), en_x.ciphertext(False))
+            self.assertAlmostEqual(self.private_key.decrypt(new_en_x), self.private_key.decrypt(en_x))
             
    
 if __name__ == '__main__': 
@@ -0,0 +1,109 @@
+#
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+
+import types
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from federatedml.secureprotol import IpclPaillierEncrypt
+
+
+class FakeCipherText(object):
+    """
+    mimics ipcl_python CipherText: holds a batch of values, indexing gives a single-value CipherText
+    """
+
+    def __init__(self, values):
+        self.values = np.asarray(values, dtype=np.float64)
+
+    def __getitem__(self, idx):
+        return FakeCipherText(self.values[idx: idx + 1])
+
+    def __add__(self, other):
+        return FakeCipherText(self.values + other.values)
+
+
+class FakePublicKey(object):
+    def encrypt(self, values):
+        return FakeCipherText(np.atleast_1d(values))
+
+
+class FakePrivateKey(object):
+    def decrypt(self, ciphertext):
+        return ciphertext.values.copy()
+
+
+class FakePaillierKeypair(object):
+    n_length = None
+
+    @classmethod
+    def generate_keypair(cls, n_length):
+        cls.n_length = n_length
+        return FakePublicKey(), FakePrivateKey()
+
+
+class TestIpclPaillierEncrypt(unittest.TestCase):
+    def setUp(self):
+        ipcl_python = types.ModuleType('ipcl_python')
+        ipcl_python.PaillierKeypair = FakePaillierKeypair
+        self.module_patcher = mock.patch.dict('sys.modules', {'ipcl_python': ipcl_python})
+        self.module_patcher.start()
+
+        self.encrypter = IpclPaillierEncrypt()
+        self.encrypter.generate_key(2048)
+
+    def tearDown(self):
+        self.module_patcher.stop()
+
+    def test_generate_key(self):
+        self.assertEqual(FakePaillierKeypair.n_length, 2048)
+        public_key, privacy_key = self.encrypter.get_key_pair()
+        self.assertIsInstance(public_key, FakePublicKey)
+        self.assertIsInstance(privacy_key, FakePrivateKey)
+
+    def test_encrypt_and_decrypt_batch(self):
+        values = [0.5, -1.25, 3, 0]
+        ciphertexts = self.encrypter.encrypt_batch(values)
+        self.assertEqual(len(ciphertexts), len(values))
+
+        plaintexts = self.encrypter.decrypt_batch(ciphertexts)
+        self.assertEqual(plaintexts, values)
+        for plaintext in plaintexts:
+            self.assertIsInstance(plaintext, float)
+
+        self.assertEqual(self.encrypter.encrypt_batch([]), [])
+
+    def test_add_ciphertexts(self):
+        ciphertexts = self.encrypter.encrypt_batch([0.5, -1.25, 3])
+        self.assertAlmostEqual(self.encrypter.decrypt(ciphertexts[0] + ciphertexts[1] + ciphertexts[2]), 2.25)
+
+    def test_recursive_encrypt_list(self):
+        values = [(1.0, 2.0), (3.0, -4.0)]
+        ciphertexts = self.encrypter.recursive_encrypt_list(values)
+        self.assertEqual(self.encrypter.recursive_decrypt_list(ciphertexts), values)
+
+    def test_without_key(self):
+        encrypter = IpclPaillierEncrypt()
+        self.assertEqual(encrypter.encrypt_batch([1.0, 2.0]), [None, None])
+        self.assertIsNone(encrypter.encrypt(1.0))
+        self.assertIsNone(encrypter.decrypt(FakeCipherText([1.0])))
+        self.assertEqual(encrypter.recursive_encrypt_list([(1.0, 2.0)]), [(None, None)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,9 @@
 import copy
 import json
+import logging
 import functools
 import numpy as np
+from fate_arch.session import computing_session as session
 from federatedml.util import LOGGER
 from federatedml.nn.homo_nn.nn_model import get_nn_builder
 from federatedml.model_base import ModelBase
@@ -41,6 +43,9 @@ class FTL(ModelBase):
         self.config_type = None
         self.comm_eff = None
         self.local_round = 1
+        self.sparse_push = False
+        self.push_eps = None
+        self.staleness = 0
 
         self.encrypted_mode_calculator_param = None
 
@@ -65,6 +70,16 @@ class FTL(ModelBase):
 
         self.cache_dataloader = {}
 
+        # components snapshots for sparse push
+        self.last_sent_components = None
+        self.last_received_components = None
+
+        # components of the other party used in current epoch
+        self.cur_received_components = None
+
+        # backward gradients buffer reused by every local round
+        self.grad_buffer = None
+
         self.validation_strategy = None
 
     def _init_model(self, param: FTLParam):
@@ -82,6 +97,9 @@ class FTL(ModelBase):
         self.mode = param.mode
         self.comm_eff = param.communication_efficient
         self.local_round = param.local_round
+        self.sparse_push = param.sparse_push
+        self.push_eps = param.push_eps
+        self.staleness = param.staleness
 
         assert 'learning_rate' in self.optimizer.kwargs, 'optimizer setting must contain learning_rate'
         self.learning_rate = self.optimizer.kwargs['learning_rate']
@@ -97,6 +115,8 @@ class FTL(ModelBase):
 
     @staticmethod
     def debug_data_inst(data_inst):
+        if not LOGGER.isEnabledFor(logging.DEBUG):
+            return
         collect_data = list(data_inst.collect())
         LOGGER.debug('showing DTable')
         for d in collect_data:
@@ -147,16 +167,28 @@ class FTL(ModelBase):
                                                      self.encrypted_mode_calculator_param.re_encrypted_rate)
         return encrypted_calculator
 
-    def encrypt_tensor(self, components, return_dtable=True):
+    def encrypt_tensor(self, components, return_dtable=True, indexes=None):
 
         """
-        transform numpy array into Paillier tensor and encrypt
+        transform numpy array into Paillier tensor and encrypt.
+        if indexes of a component is given (sparse push), component holds rows of these indexes
         """
 
         if len(self.encrypt_calculators) == 0:
             self.encrypt_calculators = [self.generated_encrypted_calculator() for i in range(3)]
+        if indexes is None:
+            indexes = [None] * len(components)
         encrypted_tensors = []
-        for comp, calculator in zip(components, self.encrypt_calculators):
+        for comp, calculator, comp_indexes in zip(components, self.encrypt_calculators, indexes):
+            if comp_indexes is not None:
+                # rows are keyed by their indexes, encrypted in strict mode as encrypted zeros of
+                # calculator are cached for full components
+                rows = session.parallelize(zip(map(int, comp_indexes), comp), include_key=True,
+                                           partition=self.partitions)
+                encrypted_tensor = PaillierTensor(tb_obj=calculator.encrypt_table(rows))
+                encrypted_tensors.append(encrypted_tensor.get_obj() if return_dtable else encrypted_tensor)
+                continue
+
             encrypted_tensor = PaillierTensor(ori_data=comp, partitions=self.partitions)
             if return_dtable:
                 encrypted_tensors.append(encrypted_tensor.encrypt(calculator).get_obj())
@@ -165,6 +197,81 @@ class FTL(ModelBase):
 
         return encrypted_tensors
 
+    def get_received_components_suffix(self, epoch_idx):
+
+        """
+        bounded staleness: components the other party sent at epoch (epoch_idx - staleness) are used at epoch_idx,
+        components of epoch 0 are used in first staleness epochs. return suffix of components to get, or None if
+        components received before are used in this epoch
+        """
+
+        if epoch_idx == 0:
+            return 0,
+        if epoch_idx <= self.staleness:
+            return None
+        return epoch_idx - self.staleness,
+
+    def drain_received_components(self, transfer_variables, last_epoch_idx):
+
+        """
+        components the other party sent in last staleness epochs are never used, get them after training so that
+        no message is left in federation
+        """
+
+        for epoch_idx in range(max(1, last_epoch_idx - self.staleness + 1), last_epoch_idx + 1):
+            for variable in transfer_variables:
+                variable.get(idx=0, suffix=(epoch_idx, ))
+
+    def get_sparse_components(self, components):
+
+        """
+        sparse push: rows of components whose max absolute change since last push is larger than push_eps
+        are sent. return indexes of sent rows and sent rows of every component, indexes are None if whole
+        component is sent. indexes are sent by guest_components/host_components transfer variables
+        """
+
+        if self.last_sent_components is None:
+            self.last_sent_components = [np.array(comp) for comp in components]
+            return [None] * len(components), components
+
+        comp_indexes, comp_rows = [], []
+        for comp, last_comp in zip(components, self.last_sent_components):
+            row_change = np.abs(comp - last_comp).reshape((len(comp), -1)).max(axis=1)
+            changed_indexes = np.where(row_change > self.push_eps)[0]
+            # snapshot keeps what the other party holds
+            last_comp[changed_indexes] = comp[changed_indexes]
+            comp_indexes.append(changed_indexes)
+            comp_rows.append(comp[changed_indexes])
+
+        LOGGER.debug('sparse push, {}/{} rows sent'.format([len(idx) for idx in comp_indexes], len(components[0])))
+
+        return comp_indexes, comp_rows
+
+    def merge_sparse_components(self, comp_indexes, components):
+
+        """
+        merge rows received by sparse push into components received before
+        """
+
+        if self.last_received_components is None:
+            self.last_received_components = list(components)
+            return components
+
+        merged_components = []
+        for idx, (comp_idx, comp, last_comp) in enumerate(zip(comp_indexes, components,
+                                                              self.last_received_components)):
+            if comp_idx is None:
+                merged = comp
+            elif self.mode == 'encrypted':
+                merged = last_comp.union(comp, lambda last_row, new_row: new_row)
+            else:
+                merged = last_comp
+                merged[comp_idx] = comp
+            self.last_received_components[idx] = merged
+            merged_components.append(merged)
+
+        return merged_components
+
     def init_validation_strategy(self, train_data=None, validate_data=None):
         validation_strategy = ValidationStrategy(self.role, consts.HETERO, self.validation_freqs,
                                                  self.early_stopping_rounds, self.use_first_metric_only)
@@ -202,10 +309,12 @@ class FTL(ModelBase):
         overlap_samples = intersect_obj.run(data_inst)  # find intersect ids
         non_overlap_samples = data_inst.subtractByKey(overlap_samples)
 
-        LOGGER.debug('num of overlap/non-overlap sampels: {}/{}'.format(overlap_samples.count(),
-                                                                        non_overlap_samples.count()))
+        overlap_num = overlap_samples.count()
+        # count() runs a job over the table, skip it unless it is logged
+        if LOGGER.isEnabledFor(logging.DEBUG):
+            LOGGER.debug('num of overlap/non-overlap sampels: {}/{}'.format(overlap_num, non_overlap_samples.count()))
 
-        if overlap_samples.count() == 0:
+        if overlap_num == 0:
             raise ValueError('no overlap samples')
 
         if guest_side and non_overlap_samples == 0:
@@ -214,17 +323,18 @@ class FTL(ModelBase):
         self.store_header = data_inst.schema['header']
         LOGGER.debug('data inst header is {}'.format(self.store_header))
 
-        LOGGER.debug('has {} overlap samples'.format(overlap_samples.count()))
+        LOGGER.debug('has {} overlap samples'.format(overlap_num))
 
+        data_num = data_inst.count()
         batch_size = self.batch_size
         if self.batch_size == -1:
-            batch_size = data_inst.count() + 1  # make sure larger than sample number
+            batch_size = data_num + 1  # make sure larger than sample number
         data_loader = FTLDataLoader(non_overlap_samples=non_overlap_samples,
                                     batch_size=batch_size, overlap_samples=overlap_samples, guest_side=guest_side)
 
         LOGGER.debug("data details are :{}".format(data_loader.data_basic_info()))
 
-        return data_loader, data_loader.x_shape, data_inst.count(), len(data_loader.get_overlap_indexes())
+        return data_loader, data_loader.x_shape, data_num, len(data_loader.get_overlap_indexes())
 
     def initialize_nn(self, input_shape):
 
@@ -241,6 +351,14 @@ class FTL(ModelBase):
         for layer in self.nn._model.layers:
             LOGGER.debug('input shape {}, output shape {}'.format(layer.input_shape, layer.output_shape))
 
+    def get_grad_buffer(self, shape):
+        """
+        return a float32 buffer for backward gradients, allocated once and reused while shape is unchanged
+        """
+        if self.grad_buffer is None or self.grad_buffer.shape != tuple(shape):
+            self.grad_buffer = np.empty(shape, dtype=np.float32)
+        return self.grad_buffer
+
     def generate_mask(self, shape):
         """
         generate random number mask
@@ -272,6 +390,10 @@ class FTL(ModelBase):
 
         assert len(data_loader.x) == len(backward_grads)
 
+        # bottom nn computes in float32, downcast decrypted grads once instead of once per batch,
+        # no copy is made for grads from the gradient buffer
+        backward_grads = np.asarray(backward_grads, dtype=np.float32)
+
         weight_grads = []
         for i in range(len(data_loader)):
             start, end = data_loader.get_batch_indexes(i)
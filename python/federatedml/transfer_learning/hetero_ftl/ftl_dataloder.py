@@ -13,42 +13,48 @@ class FTLDataLoader(tf.keras.utils.Sequence):
         self._overlap_index = []
         self._non_overlap_index = []
 
-        if guest_side:
-            self.size = non_overlap_samples.count() + overlap_samples.count()
-        else:
-            self.size = overlap_samples.count()
-
-        _, one_data = overlap_samples.first()
+        # samples are collected once, features and labels are stacked into arrays by numpy.
+        # features are kept in float32, the dtype bottom nn computes in, which halves resident memory of x
+        self._overlap_keys, overlap_x, overlap_y = self.collect_samples(overlap_samples, guest_side)
+        overlap_num = len(self._overlap_keys)
         self.y_shape = (1,)
-        self.x_shape = one_data.features.shape
-
-        self.x = np.zeros((self.size, *self.x_shape))
-        self.y = np.zeros((self.size, *self.y_shape))
-        index = 0
-        self._overlap_keys = []
-        self._non_overlap_keys = []
+        self.x_shape = overlap_x.shape[1:]
 
-        for k, inst in overlap_samples.collect():
-            self._overlap_keys.append(k)
-            self.x[index] = inst.features
-            if guest_side:
-                self.y[index] = inst.label
-            index += 1
+        if guest_side:
+            self._non_overlap_keys, non_overlap_x, non_overlap_y = self.collect_samples(non_overlap_samples,
+                                                                                        guest_side,
+                                                                                        x_shape=self.x_shape)
+            self.x = np.concatenate([overlap_x, non_overlap_x], axis=0)
+            self.y = np.concatenate([overlap_y, non_overlap_y], axis=0)
+        else:
+            self._non_overlap_keys = []
+            self.x = overlap_x
+            self.y = np.zeros((overlap_num, *self.y_shape))
 
-        if self.guest_side:
-            for k, inst in non_overlap_samples.collect():
-                self._non_overlap_keys.append(k)
-                self.x[index] = inst.features
-                if guest_side:
-                    self.y[index] = inst.label
-                index += 1
+        self.size = len(self.x)
 
         if guest_side:
-            self._overlap_index = np.array(list(range(0, overlap_samples.count())))
-            self._non_overlap_index = np.array(list(range(overlap_samples.count(), self.size)))
+            self._overlap_index = np.arange(0, overlap_num)
+            self._non_overlap_index = np.arange(overlap_num, self.size)
         else:
             self._overlap_index = list(range(len(self.x)))
 
+    @staticmethod
+    def collect_samples(samples, with_label, x_shape=None):
+        keys, features, labels = [], [], []
+        for k, inst in samples.collect():
+            keys.append(k)
+            features.append(inst.features)
+            if with_label:
+                labels.append(inst.label)
+
+        if len(keys) == 0:
+            return keys, np.zeros((0, *x_shape), dtype=np.float32), np.zeros((0, 1))
+
+        x = np.array(features, dtype=np.float32)
+        y = np.array(labels, dtype=np.float64).reshape((-1, 1)) if with_label else None
+        return keys, x, y
+
     def get_overlap_indexes(self):
         return self._overlap_index
 
@@ -1,3 +1,4 @@
+import logging
 import numpy as np
 from fate_arch.session import computing_session as session
 from federatedml.util import consts
@@ -60,7 +61,7 @@ class FTLGuest(FTL):
 
             relative_overlap_index = data_loader.get_relative_overlap_index(i)
             if len(relative_overlap_index) != 0:
-                if self.verbose:
+                if self.verbose and LOGGER.isEnabledFor(logging.DEBUG):
                     LOGGER.debug('batch {}/{} overlap index is {}'.format(i, len(data_loader), relative_overlap_index))
                 overlap_ua.append(ua_batch[relative_overlap_index])
 
@@ -104,69 +105,91 @@ class FTLGuest(FTL):
         send guest components and get host components
         """
 
+        suffix = (epoch_idx, )
+        comp_indexes = None
+        if self.sparse_push:
+            comp_indexes, comp_to_send = self.get_sparse_components(comp_to_send)
+            self.transfer_variable.guest_components.remote(comp_indexes, suffix=suffix)
+
         if self.mode == 'encrypted':
-            comp_to_send = self.encrypt_tensor(comp_to_send)
+            comp_to_send = self.encrypt_tensor(comp_to_send, indexes=comp_indexes)
 
         # sending [y_overlap_2_phi_2, y_overlap_phi, mapping_comp_a]
-        self.transfer_variable.y_overlap_2_phi_2.remote(comp_to_send[0], suffix=(epoch_idx, ))
-        self.transfer_variable.y_overlap_phi.remote(comp_to_send[1], suffix=(epoch_idx, ))
-        self.transfer_variable.mapping_comp_a.remote(comp_to_send[2], suffix=(epoch_idx, ))
+        self.transfer_variable.y_overlap_2_phi_2.remote(comp_to_send[0], suffix=suffix)
+        self.transfer_variable.y_overlap_phi.remote(comp_to_send[1], suffix=suffix)
+        self.transfer_variable.mapping_comp_a.remote(comp_to_send[2], suffix=suffix)
 
         # receiving [overlap_ub, overlap_ub_2, mapping_comp_b]
-        overlap_ub = self.transfer_variable.overlap_ub.get(idx=0, suffix=(epoch_idx, ))
-        overlap_ub_2 = self.transfer_variable.overlap_ub_2.get(idx=0, suffix=(epoch_idx, ))
-        mapping_comp_b = self.transfer_variable.mapping_comp_b.get(idx=0, suffix=(epoch_idx, ))
+        get_suffix = self.get_received_components_suffix(epoch_idx)
+        if get_suffix is None:
+            return self.cur_received_components
+
+        overlap_ub = self.transfer_variable.overlap_ub.get(idx=0, suffix=get_suffix)
+        overlap_ub_2 = self.transfer_variable.overlap_ub_2.get(idx=0, suffix=get_suffix)
+        mapping_comp_b = self.transfer_variable.mapping_comp_b.get(idx=0, suffix=get_suffix)
         host_components = [overlap_ub, overlap_ub_2, mapping_comp_b]
 
+        if self.sparse_push:
+            host_comp_indexes = self.transfer_variable.host_components.get(idx=0, suffix=get_suffix)
+            host_components = self.merge_sparse_components(host_comp_indexes, host_components)
+
         if self.mode == 'encrypted':
-            host_paillier_tensors = [PaillierTensor(tb_obj=tb, partitions=self.partitions) for tb in host_components]
-            return host_paillier_tensors
-        else:
-            return host_components
+            host_components = [PaillierTensor(tb_obj=tb, partitions=self.partitions) for tb in host_components]
+
+        self.cur_received_components = host_components
+        return host_components
 
-    def decrypt_inter_result(self, encrypted_const, grad_a_overlap, epoch_idx, local_round=-1):
+    def decrypt_inter_result(self, encrypted_const, grad_a_overlap, epoch_idx, local_round=-1, encrypted_loss=None):
 
         """
-        add random mask to encrypted inter-result, get decrypted data from host add subtract random mask
+        add random mask to encrypted inter-result, get decrypted data from host add subtract random mask.
+        host data is decrypted while host is decrypting guest data, so that decryption of two parties overlaps.
+        encrypted loss is sent and decrypted together with const, decrypted loss is None if not given
         """
 
+        suffix = (epoch_idx, local_round)
         rand_0 = self.rng_generator.generate_random_number(encrypted_const.shape)
         encrypted_const = encrypted_const + rand_0
-        rand_1 = PaillierTensor(ori_data=self.rng_generator.generate_random_number(grad_a_overlap.shape), partitions=self.partitions)
-        grad_a_overlap = grad_a_overlap + rand_1
-
-        self.transfer_variable.guest_side_const.remote(encrypted_const, suffix=(epoch_idx,
-                                                                                local_round,))
-        self.transfer_variable.guest_side_gradients.remote(grad_a_overlap.get_obj(), suffix=(epoch_idx,
-                                                                                             local_round,))
-        const = self.transfer_variable.decrypted_guest_const.get(suffix=(epoch_idx, local_round, ), idx=0)
-        grad = self.transfer_variable.decrypted_guest_gradients.get(suffix=(epoch_idx, local_round, ), idx=0)
+        rand_1 = self.rng_generator.generate_random_number(grad_a_overlap.shape)
+        grad_a_overlap = grad_a_overlap.add_by_index(rand_1)
+
+        self.transfer_variable.guest_side_const.remote((encrypted_const, encrypted_loss), suffix=suffix)
+        self.transfer_variable.guest_side_gradients.remote(grad_a_overlap.get_obj(), suffix=suffix)
+        self.decrypt_host_data(epoch_idx, local_round=local_round)
+
+        const, loss = self.transfer_variable.decrypted_guest_const.get(suffix=suffix, idx=0)
+        grad = self.transfer_variable.decrypted_guest_gradients.get(suffix=suffix, idx=0)
         const = const - rand_0
-        grad_a_overlap = PaillierTensor(tb_obj=grad, partitions=self.partitions) - rand_1
+        grad_a_overlap = PaillierTensor(tb_obj=grad, partitions=self.partitions).numpy() - rand_1
 
-        return const, grad_a_overlap
+        return const, grad_a_overlap, loss
 
     def decrypt_host_data(self, epoch_idx, local_round=-1):
 
-        inter_grad = self.transfer_variable.host_side_gradients.get(suffix=(epoch_idx,
-                                                                            local_round,
-                                                                            'host_de_send'), idx=0)
+        suffix = (epoch_idx, local_round)
+        inter_grad = self.transfer_variable.host_side_gradients.get(suffix=suffix + ('host_de_send', ), idx=0)
         inter_grad_pt = PaillierTensor(tb_obj=inter_grad, partitions=self.partitions)
         self.transfer_variable.decrypted_host_gradients.remote(inter_grad_pt.decrypt(self.encrypter).get_obj(),
-                                                               suffix=(epoch_idx,
-                                                                       local_round,
-                                                                       'host_de_get'))
+                                                               suffix=suffix + ('host_de_get', ))
 
-    def decrypt_loss_val(self, encrypted_loss, epoch_idx):
+    def stack_backward_gradients(self, grad_a_overlap, grad_a_nonoverlap):
 
-        self.transfer_variable.encrypted_loss.remote(encrypted_loss, suffix=(epoch_idx, 'send_loss'))
-        decrypted_loss = self.transfer_variable.decrypted_loss.get(idx=0, suffix=(epoch_idx, 'get_loss'))
-        return decrypted_loss
+        """
+        write overlap and non-overlap gradients into the reused gradient buffer, overlap samples come first
+        """
 
-    def compute_backward_gradients(self, host_components, data_loader: FTLDataLoader, epoch_idx, local_round=-1):
+        overlap_num = len(grad_a_overlap)
+        grads = self.get_grad_buffer((overlap_num + len(grad_a_nonoverlap), *grad_a_overlap.shape[1:]))
+        grads[:overlap_num] = grad_a_overlap
+        grads[overlap_num:] = grad_a_nonoverlap
+        return grads
+
+    def compute_backward_gradients(self, host_components, data_loader: FTLDataLoader, epoch_idx, local_round=-1,
+                                   encrypted_loss=None):
 
         """
-        compute backward gradients using host components
+        compute backward gradients using host components, return gradients and decrypted loss.
+        in encrypted mode, encrypted_loss is decrypted by host along with inter-result
         """
 
         # they are Paillier tensors or np array
@@ -184,7 +207,7 @@ class FTLGuest(FTL):
             grad_a_nonoverlap = self.alpha * const * data_loader.y[data_loader.get_non_overlap_indexes()] / self.data_num
             grad_a_overlap = self.alpha * const * self.overlap_y / self.data_num + mapping_comp_b
 
-            return np.concatenate([grad_a_overlap, grad_a_nonoverlap], axis=0)
+            return self.stack_backward_gradients(grad_a_overlap, grad_a_nonoverlap), None
 
         elif self.mode == 'encrypted':
 
@@ -200,19 +223,18 @@ class FTLGuest(FTL):
 
             grad_a_overlap = self.overlap_y_pt.map_ndarray_product((self.alpha/self.data_num * encrypted_const)) + mapping_comp_b
 
-            const, grad_a_overlap = self.decrypt_inter_result(encrypted_const, grad_a_overlap, epoch_idx=epoch_idx
-                                                              , local_round=local_round)
-
-            self.decrypt_host_data(epoch_idx, local_round=local_round)
+            const, grad_a_overlap, loss = self.decrypt_inter_result(encrypted_const, grad_a_overlap,
+                                                                    epoch_idx=epoch_idx, local_round=local_round,
+                                                                    encrypted_loss=encrypted_loss)
 
             grad_a_nonoverlap = self.alpha * const * data_loader.y[data_loader.get_non_overlap_indexes()]/self.data_num
 
-            return np.concatenate([grad_a_overlap.numpy(), grad_a_nonoverlap], axis=0)
+            return self.stack_backward_gradients(grad_a_overlap, grad_a_nonoverlap), loss
 
-    def compute_loss(self, host_components, epoch_idx, overlap_num):
+    def compute_loss(self, host_components, overlap_num):
 
         """
-        compute training loss
+        compute training loss, loss is encrypted in encrypted mode
         """
 
         overlap_ub, overlap_ub_2, mapping_comp_b = host_components[0], host_components[1], host_components[2]
@@ -231,7 +253,7 @@ class FTLGuest(FTL):
         elif self.mode == 'encrypted':
 
             loss_overlap = overlap_ub.element_wise_product((-self.overlap_ua*self.constant_k))
-            sum = np.sum(loss_overlap.reduce_sum())
+            loss_overlap_sum = np.sum(loss_overlap.reduce_sum())
             ub_phi = overlap_ub.T.fast_matmul_2d(self.phi.transpose())
 
             part1 = -0.5 * np.sum((self.overlap_y * ub_phi))
@@ -241,11 +263,9 @@ class FTLGuest(FTL):
             part3 = len(self.overlap_y)*np.log(2)
 
             loss_y = part1 + part2 + part3
-            en_loss = (self.alpha/self.overlap_num) * loss_y + sum / overlap_num
+            en_loss = (self.alpha/self.overlap_num) * loss_y + loss_overlap_sum / overlap_num
 
-            loss_val = self.decrypt_loss_val(en_loss, epoch_idx)
-
-            return loss_val
+            return en_loss
 
     @staticmethod
     def sigmoid(x):
@@ -306,18 +326,35 @@ class FTLGuest(FTL):
             host_components = self.exchange_components(self.send_components, epoch_idx=epoch_idx)
 
             loss = None
+            is_converged = False
 
             for local_round_idx in range(self.local_round):
 
                 if self.comm_eff:
                     LOGGER.debug('running local iter {}'.format(local_round_idx))
 
-                grads = self.compute_backward_gradients(host_components, data_loader, epoch_idx=epoch_idx,
-                                                        local_round=local_round_idx)
+                encrypted_loss = None
+                if local_round_idx == 0:
+                    loss = self.compute_loss(host_components, len(data_loader.get_overlap_indexes()))
+                    if self.mode == 'encrypted':
+                        # encrypted loss is decrypted by host together with inter-result of first local round
+                        encrypted_loss = loss
+
+                grads, decrypted_loss = self.compute_backward_gradients(host_components, data_loader,
+                                                                        epoch_idx=epoch_idx,
+                                                                        local_round=local_round_idx,
+                                                                        encrypted_loss=encrypted_loss)
                 self.update_nn_weights(grads, data_loader, epoch_idx, decay=self.comm_eff)
 
-                if local_round_idx == 0:
-                    loss = self.compute_loss(host_components, epoch_idx, len(data_loader.get_overlap_indexes()))
+                if encrypted_loss is not None:
+                    loss = decrypted_loss
+
+                # check n_iter_no_change once loss is ready, so that both parties skip remaining local rounds
+                if local_round_idx == 0 and self.n_iter_no_change is True:
+                    is_converged = self.check_convergence(loss)
+                    self.sync_stop_flag(epoch_idx, stop_flag=is_converged)
+                    if is_converged:
+                        break
 
                 if local_round_idx + 1 != self.local_round:
                     self.phi, self.overlap_ua = self.compute_phi_and_overlap_ua(data_loader)
@@ -326,7 +363,7 @@ class FTLGuest(FTL):
             self.history_loss.append(loss)
 
             # updating variables for next epochs
-            if epoch_idx + 1 == self.epochs:
+            if epoch_idx + 1 == self.epochs or is_converged:
                 # only need to update phi in last epochs
                 self.phi, _ = self.compute_phi_and_overlap_ua(data_loader)
             else:
@@ -341,16 +378,17 @@ class FTLGuest(FTL):
                     LOGGER.debug('early stopping triggered')
                     break
 
-            # check n_iter_no_change
-            if self.n_iter_no_change is True:
-                if self.check_convergence(loss):
-                    self.sync_stop_flag(epoch_idx, stop_flag=True)
-                    break
-                else:
-                    self.sync_stop_flag(epoch_idx, stop_flag=False)
+            if is_converged:
+                break
 
             LOGGER.debug('fitting epoch {} done, loss is {}'.format(epoch_idx, loss))
 
+        stale_variables = [self.transfer_variable.overlap_ub, self.transfer_variable.overlap_ub_2,
+                           self.transfer_variable.mapping_comp_b]
+        if self.sparse_push:
+            stale_variables.append(self.transfer_variable.host_components)
+        self.drain_received_components(stale_variables, last_epoch_idx=epoch_idx)
+
         self.callback_meta("loss",
                            "train",
                            MetricMeta(name="train",
@@ -1,3 +1,4 @@
+import logging
 import numpy as np
 from federatedml.transfer_learning.hetero_ftl.ftl_base import FTL
 from federatedml.statistic.intersect import intersect_host
@@ -44,7 +45,7 @@ class FTLHost(FTL):
         overlap_ub_2 = np.matmul(np.expand_dims(overlap_ub, axis=2), np.expand_dims(overlap_ub, axis=1))
         mapping_comp_b = - overlap_ub * self.constant_k
 
-        if self.verbose:
+        if self.verbose and LOGGER.isEnabledFor(logging.DEBUG):
             LOGGER.debug('overlap_ub is {}'.format(overlap_ub))
             LOGGER.debug('overlap_ub_2 is {}'.format(overlap_ub_2))
 
@@ -56,51 +57,72 @@ class FTLHost(FTL):
         compute host components and sent to guest
         """
 
+        suffix = (epoch_idx, )
+        comp_indexes = None
+        if self.sparse_push:
+            comp_indexes, comp_to_send = self.get_sparse_components(comp_to_send)
+
         if self.mode == 'encrypted':
-            comp_to_send = self.encrypt_tensor(comp_to_send)
+            comp_to_send = self.encrypt_tensor(comp_to_send, indexes=comp_indexes)
 
         # receiving guest components
-        y_overlap_2_phi_2 = self.transfer_variable.y_overlap_2_phi_2.get(idx=0, suffix=(epoch_idx, ))
-        y_overlap_phi = self.transfer_variable.y_overlap_phi.get(idx=0, suffix=(epoch_idx, ))
-        mapping_comp_a = self.transfer_variable.mapping_comp_a.get(idx=0, suffix=(epoch_idx, ))
-        guest_components = [y_overlap_2_phi_2, y_overlap_phi, mapping_comp_a]
+        get_suffix = self.get_received_components_suffix(epoch_idx)
+        if get_suffix is not None:
+            y_overlap_2_phi_2 = self.transfer_variable.y_overlap_2_phi_2.get(idx=0, suffix=get_suffix)
+            y_overlap_phi = self.transfer_variable.y_overlap_phi.get(idx=0, suffix=get_suffix)
+            mapping_comp_a = self.transfer_variable.mapping_comp_a.get(idx=0, suffix=get_suffix)
+            guest_components = [y_overlap_2_phi_2, y_overlap_phi, mapping_comp_a]
+
+            if self.sparse_push:
+                guest_comp_indexes = self.transfer_variable.guest_components.get(idx=0, suffix=get_suffix)
+                guest_components = self.merge_sparse_components(guest_comp_indexes, guest_components)
+
+            if self.mode == 'encrypted':
+                guest_components = [PaillierTensor(tb_obj=tb, partitions=self.partitions) for tb in guest_components]
+
+            self.cur_received_components = guest_components
 
         # sending host components
-        self.transfer_variable.overlap_ub.remote(comp_to_send[0], suffix=(epoch_idx, ))
-        self.transfer_variable.overlap_ub_2.remote(comp_to_send[1], suffix=(epoch_idx, ))
-        self.transfer_variable.mapping_comp_b.remote(comp_to_send[2], suffix=(epoch_idx, ))
+        if self.sparse_push:
+            self.transfer_variable.host_components.remote(comp_indexes, suffix=suffix)
+        self.transfer_variable.overlap_ub.remote(comp_to_send[0], suffix=suffix)
+        self.transfer_variable.overlap_ub_2.remote(comp_to_send[1], suffix=suffix)
+        self.transfer_variable.mapping_comp_b.remote(comp_to_send[2], suffix=suffix)
 
-        if self.mode == 'encrypted':
-            guest_paillier_tensors = [PaillierTensor(tb_obj=tb, partitions=self.partitions) for tb in guest_components]
-            return guest_paillier_tensors
-        else:
-            return guest_components
+        return self.cur_received_components
 
     def decrypt_guest_data(self, epoch_idx, local_round=-1):
 
-        encrypted_consts = self.transfer_variable.guest_side_const.get(suffix=(epoch_idx, local_round, ),
-                                                                       idx=0)
-        grad_table = self.transfer_variable.guest_side_gradients.get(suffix=(epoch_idx, local_round, ),
-                                                                     idx=0)
+        suffix = (epoch_idx, local_round)
+        encrypted_consts, encrypted_loss = self.transfer_variable.guest_side_const.get(suffix=suffix, idx=0)
+        grad_table = self.transfer_variable.guest_side_gradients.get(suffix=suffix, idx=0)
 
         inter_grad = PaillierTensor(tb_obj=grad_table, partitions=self.partitions)
         decrpyted_grad = inter_grad.decrypt(self.encrypter)
         decrypted_const = self.encrypter.recursive_decrypt(encrypted_consts)
+        # guest loss comes with inter-result of first local round
+        decrypted_loss = None if encrypted_loss is None else self.encrypter.recursive_decrypt(encrypted_loss)
 
-        self.transfer_variable.decrypted_guest_const.remote(decrypted_const,
-                                                            suffix=(epoch_idx, local_round, ))
-        self.transfer_variable.decrypted_guest_gradients.remote(decrpyted_grad.get_obj(),
-                                                                suffix=(epoch_idx, local_round, ))
+        self.transfer_variable.decrypted_guest_const.remote((decrypted_const, decrypted_loss), suffix=suffix)
+        self.transfer_variable.decrypted_guest_gradients.remote(decrpyted_grad.get_obj(), suffix=suffix)
 
     def decrypt_inter_result(self, loss_grad_b, epoch_idx, local_round=-1):
 
-        rand_0 = PaillierTensor(ori_data=self.rng_generator.generate_random_number(loss_grad_b.shape), partitions=self.partitions)
-        grad_a_overlap = loss_grad_b + rand_0
+        """
+        send masked inter-result to guest, then decrypt guest data while guest is decrypting host data,
+        so that decryption of two parties overlaps
+        """
+
+        suffix = (epoch_idx, local_round)
+        rand_0 = self.rng_generator.generate_random_number(loss_grad_b.shape)
+        grad_a_overlap = loss_grad_b.add_by_index(rand_0)
         self.transfer_variable.host_side_gradients.remote(grad_a_overlap.get_obj(),
-                                                          suffix=(epoch_idx, local_round, 'host_de_send'))
+                                                          suffix=suffix + ('host_de_send', ))
+        self.decrypt_guest_data(epoch_idx, local_round=local_round)
+
         de_loss_grad_b = self.transfer_variable.decrypted_host_gradients\
-                                               .get(suffix=(epoch_idx, local_round, 'host_de_get'), idx=0)
-        de_loss_grad_b = PaillierTensor(tb_obj=de_loss_grad_b, partitions=self.partitions) - rand_0
+                                               .get(suffix=suffix + ('host_de_get', ), idx=0)
+        de_loss_grad_b = PaillierTensor(tb_obj=de_loss_grad_b, partitions=self.partitions).numpy() - rand_0
 
         return de_loss_grad_b
 
@@ -131,24 +153,9 @@ class FTLHost(FTL):
             l1_grad_b = ub_overlap_y_overlap_2_phi_2 + y_overlap_phi
             en_loss_grad_b = l1_grad_b * self.alpha + mapping_comp_a
 
-            self.decrypt_guest_data(epoch_idx, local_round=local_round)
             loss_grad_b = self.decrypt_inter_result(en_loss_grad_b, epoch_idx, local_round=local_round)
 
-            return loss_grad_b.numpy()
-
-    def compute_loss(self, epoch_idx):
-
-        """
-        help guest compute ftl loss. plain mode will skip/ in encrypted mode will decrypt received loss
-        """
-
-        if self.mode == 'plain':
-            return
-
-        elif self.mode == 'encrypted':
-            encrypted_loss = self.transfer_variable.encrypted_loss.get(idx=0, suffix=(epoch_idx, 'send_loss'))
-            rs = self.encrypter.recursive_decrypt(encrypted_loss)
-            self.transfer_variable.decrypted_loss.remote(rs, suffix=(epoch_idx, 'get_loss'))
+            return loss_grad_b
 
     def fit(self, data_inst, validate_data=None):
 
@@ -175,6 +182,7 @@ class FTLHost(FTL):
             self.overlap_ub, self.overlap_ub_2, self.mapping_comp_b = self.batch_compute_components(data_loader)
             send_components = [self.overlap_ub, self.overlap_ub_2, self.mapping_comp_b]
             guest_components = self.exchange_components(send_components, epoch_idx)
+            stop_flag = False
 
             for local_round_idx in range(self.local_round):
 
@@ -185,8 +193,11 @@ class FTLHost(FTL):
                                                         local_round=local_round_idx)
                 self.update_nn_weights(grads, data_loader, epoch_idx, decay=self.comm_eff)
 
-                if local_round_idx == 0:
-                    self.compute_loss(epoch_idx)
+                # guest checks n_iter_no_change after first local round
+                if local_round_idx == 0 and self.n_iter_no_change is True:
+                    stop_flag = self.sync_stop_flag(epoch_idx)
+                    if stop_flag:
+                        break
 
                 if local_round_idx + 1 != self.local_round:
                     self.overlap_ub, self.overlap_ub_2, self.mapping_comp_b = self.batch_compute_components(data_loader)
@@ -197,13 +208,17 @@ class FTLHost(FTL):
                     LOGGER.debug('early stopping triggered')
                     break
 
-            if self.n_iter_no_change is True:
-                stop_flag = self.sync_stop_flag(epoch_idx)
-                if stop_flag:
-                    break
+            if stop_flag:
+                break
 
             LOGGER.debug('fitting epoch {} done'.format(epoch_idx))
 
+        stale_variables = [self.transfer_variable.y_overlap_2_phi_2, self.transfer_variable.y_overlap_phi,
+                           self.transfer_variable.mapping_comp_a]
+        if self.sparse_push:
+            stale_variables.append(self.transfer_variable.guest_components)
+        self.drain_received_components(stale_variables, last_epoch_idx=epoch_idx)
+
         self.set_summary(self.generate_summary())
 
     def generate_summary(self):
@@ -79,5 +79,27 @@ class TestFTL(unittest.TestCase):
         new_label = [i[1].label for i in list(rs.collect())]
         print(new_label)
 
+    def test_sparse_push(self):
+
+        sender, receiver = FTL(), FTL()
+        sender.push_eps = receiver.push_eps = 1e-4
+        components = [np.random.random((10, 3, 3)), np.random.random((10, 3))]
+
+        indexes, rows = sender.get_sparse_components(components)
+        received = receiver.merge_sparse_components(indexes, [comp.copy() for comp in rows])
+        self.assertTrue(all(idx is None for idx in indexes))
+
+        new_components = [comp.copy() for comp in components]
+        new_components[0][[1, 5]] += 1
+        new_components[1][2] += 1e-6
+        indexes, rows = sender.get_sparse_components(new_components)
+        self.assertListEqual(list(indexes[0]), [1, 5])
+        self.assertEqual(len(indexes[1]), 0)
+
+        received = receiver.merge_sparse_components(indexes, rows)
+        self.assertTrue(np.fabs(received[0] - new_components[0]).max() < 1e-8)
+        self.assertTrue(np.fabs(received[1] - new_components[1]).max() <= 1e-4)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -64,6 +64,30 @@ class TestPaillierTensor(unittest.TestCase):
         enpt2 = pt4.encrypt(encrypted_calculator)
         random_num = rng_generator.generate_random_number(enpt2.shape)
 
+    def test_decrypt(self):
+
+        arr = np.random.random((20, 2, 3))
+        pt = PaillierTensor(ori_data=arr, partitions=4)
+
+        encrypter = PaillierEncrypt()
+        encrypter.generate_key(EncryptParam().key_length)
+        encrypted_calculator = EncryptModeCalculator(encrypter,
+                                                     EncryptedModeCalculatorParam().mode,
+                                                     EncryptedModeCalculatorParam().re_encrypted_rate)
+
+        decrypted = pt.encrypt(encrypted_calculator).decrypt(encrypter).numpy()
+        self.assertEqual(decrypted.shape, arr.shape)
+        self.assertTrue(np.fabs(decrypted - arr).max() < 1e-5)
+
+    def test_add_by_index(self):
+
+        arr = np.random.random((20, 3))
+        mask = np.random.random((20, 3))
+        pt = PaillierTensor(ori_data=arr, partitions=4)
+
+        masked = pt.add_by_index(mask).numpy()
+        self.assertTrue(np.fabs(masked - arr - mask).max() < 1e-8)
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -42,8 +42,6 @@ class FTLTransferVariable(BaseTransferVariables):
         self.host_side_gradients = self._create_variable(name='host_side_gradients', src=['host'], dst=['guest'])
         self.guest_side_gradients = self._create_variable(name='guest_side_gradients', src=['guest'], dst=['host'])
         self.guest_side_const = self._create_variable(name='guest_side_const', src=['guest'], dst=['host'])
-        self.encrypted_loss = self._create_variable(name='encrypted_loss', src=['guest'], dst=['host'])
-        self.decrypted_loss = self._create_variable(name='decrypted_loss', src=['host'], dst=['guest'])
         self.decrypted_guest_gradients = self._create_variable(name='decrypted_guest_gradients', src=['host'], dst=['guest'])
         self.decrypted_guest_const = self._create_variable(name='decrypted_guest_const', src=['host'], dst=['guest'])
         self.decrypted_host_gradients = self._create_variable(name='decrypted_host_gradients', src=['guest'], dst=['host'])
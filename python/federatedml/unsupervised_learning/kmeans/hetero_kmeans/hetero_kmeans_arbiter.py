@@ -14,6 +14,8 @@
 #  limitations under the License.
 #
 
+import math
+
 import numpy as np
 
 from fate_arch.session import computing_session as session
@@ -24,7 +26,6 @@ from federatedml.framework.hetero.procedure import table_aggregator
 from federatedml.param.hetero_kmeans_param import KmeansParam
 from federatedml.unsupervised_learning.kmeans.kmeans_model_base import BaseKmeansModel
 from federatedml.util import LOGGER
-from federatedml.util import consts
 from federatedml.framework.weights import NumpyWeights
 
 
@@ -49,24 +50,49 @@ class HeteroKmeansArbiter(BaseKmeansModel):
                              metric_namespace='train',
                              metric_data=[Metric(iter_num, dbi)])
 
-    def sum_in_cluster(self, iterator):
-        sum_result = dict()
+    @staticmethod
+    def sum_in_cluster(iterator):
+        """
+        sum of distances and sample count of each cluster in a partition, as array [dist_sum, count]
+        """
+        # distances are scalars, math.sqrt avoids numpy ufunc dispatch per sample,
+        # aggregated distance of a centroid itself may be slightly negative after secure aggregation
+        dist_sum = dict()
+        cluster_count = dict()
         for k, v in iterator:
-            if v[1] not in sum_result:
-                sum_result[v[1]] = np.sqrt(v[0][v[1]])
-            else:
-                sum_result[v[1]] += np.sqrt(v[0][v[1]])
-        return sum_result
-
-    def cal_ave_dist(self, dist_cluster_table, cluster_result):
-        dist_centroid_dist_table = dist_cluster_table.applyPartitions(self.sum_in_cluster).reduce(self.sum_dict)
-        cluster_count = cluster_result.applyPartitions(self.count).reduce(self.sum_dict)
+            dist, cluster = v
+            dist_sum[cluster] = dist_sum.get(cluster, 0.0) + math.sqrt(max(dist[cluster], 0.0))
+            cluster_count[cluster] = cluster_count.get(cluster, 0) + 1
+        return {cluster: np.array([dist_sum[cluster], cluster_count[cluster]]) for cluster in dist_sum}
+
+    def cal_ave_dist(self, dist_cluster_table):
+        # distance sums and counts come from one pass, clusters are listed in order of cluster id
+        dist_sum_count = dist_cluster_table.applyPartitions(self.sum_in_cluster).reduce(self.sum_dict)
         cal_ave_dist_list = []
-        for key in cluster_count.keys():
-            count = cluster_count[key]
-            cal_ave_dist_list.append([key, count, dist_centroid_dist_table[key] / count])
+        for key in sorted(dist_sum_count.keys()):
+            dist_sum, count = dist_sum_count[key]
+            cal_ave_dist_list.append([key, int(count), dist_sum / count])
         return cal_ave_dist_list
 
+    @staticmethod
+    def assign_partition(kv_iterator):
+        """
+        assign samples of a partition to their nearest clusters with one argmin over stacked distances.
+        cluster ids are sent back to all clients, a python int pickles to a few bytes while numpy int64 takes ~100
+        """
+        keys, dists = [], []
+        for key, dist in kv_iterator:
+            keys.append(key)
+            dists.append(dist)
+
+        if len(keys) == 0:
+            return []
+
+        return list(zip(keys, np.argmin(np.asarray(dists), axis=1).tolist()))
+
+    def assign_cluster(self, dist_table):
+        return dist_table.mapPartitions(self.assign_partition, use_previous_behavior=False, preserves_partitioning=True)
+
     @staticmethod
     def max_radius(iterator):
         radius_result = dict()
@@ -86,7 +112,7 @@ class HeteroKmeansArbiter(BaseKmeansModel):
 
     def cal_dbi(self, dist_sum, cluster_result, suffix):
         dist_cluster_table = dist_sum.join(cluster_result, lambda v1, v2: [v1, v2])
-        dist_table = self.cal_ave_dist(dist_cluster_table, cluster_result)  # ave dist in each cluster
+        dist_table = self.cal_ave_dist(dist_cluster_table)  # ave dist in each cluster
         if len(dist_table) == 1:
             raise ValueError('Only one class detected. DBI calculation error')
         cluster_dist = self.aggregator.sum_model(suffix=(suffix,))
@@ -104,17 +130,15 @@ class HeteroKmeansArbiter(BaseKmeansModel):
             dist_sum = self.aggregator.aggregate_tables(suffix=(self.n_iter_,))
             if last_cluster_result is not None:
                 self.cal_dbi(dist_sum, last_cluster_result, self.n_iter_)
-            cluster_result = dist_sum.mapValues(lambda v: np.argmin(v))
+            cluster_result = self.assign_cluster(dist_sum)
             self.aggregator.send_aggregated_tables(cluster_result, suffix=(self.n_iter_,))
-            tol1 = self.transfer_variable.guest_tol.get(idx=0, suffix=(self.n_iter_,))
-            tol2 = self.transfer_variable.host_tol.get(idx=0, suffix=(self.n_iter_,))
-            tol_final = tol1 + tol2
-            self.is_converged = True if tol_final < self.tol else False
+            tol_final = self.transfer_variable.guest_tol.get(idx=0, suffix=(self.n_iter_,)) + \
+                self.transfer_variable.host_tol.get(idx=0, suffix=(self.n_iter_,))
+            self.is_converged = bool(tol_final < self.tol)
             LOGGER.debug(f"iter: {self.n_iter_}, tol_final: {tol_final}, tol: {self.tol},"
                          f" is_converge: {self.is_converged}")
-            self.transfer_variable.arbiter_tol.remote(self.is_converged, role=consts.HOST, idx=-1,
-                                                      suffix=(self.n_iter_,))
-            self.transfer_variable.arbiter_tol.remote(self.is_converged, role=consts.GUEST, idx=0,
+            # one broadcast to guest and all hosts
+            self.transfer_variable.arbiter_tol.remote(self.is_converged, role=None, idx=-1,
                                                       suffix=(self.n_iter_,))
             last_cluster_result = cluster_result
             self.n_iter_ += 1
@@ -124,7 +148,7 @@ class HeteroKmeansArbiter(BaseKmeansModel):
 
         # calculate finall round dbi
         dist_sum = self.aggregator.aggregate_tables(suffix=(self.n_iter_,))
-        cluster_result = dist_sum.mapValues(lambda v: np.argmin(v))
+        cluster_result = self.assign_cluster(dist_sum)
         self.aggregator.send_aggregated_tables(cluster_result, suffix=(self.n_iter_,))
         self.cal_dbi(dist_sum, last_cluster_result, self.n_iter_)
         dist_sum_dbi = self.aggregator.aggregate_tables(suffix=(self.n_iter_ + 1,))
@@ -134,7 +158,7 @@ class HeteroKmeansArbiter(BaseKmeansModel):
     def predict(self, data_instances=None):
         LOGGER.info("Start predict ...")
         res_dict = self.aggregator.aggregate_tables(suffix='predict')
-        cluster_result = res_dict.mapValues(lambda v: np.argmin(v))
+        cluster_result = self.assign_cluster(res_dict)
         cluster_dist_result = res_dict.mapValues(lambda v: min(v))
         self.aggregator.send_aggregated_tables(cluster_result, suffix='predict')
 
@@ -142,8 +166,8 @@ class HeteroKmeansArbiter(BaseKmeansModel):
         self.aggregator.send_aggregated_tables(cluster_result, suffix='predict_dbi')
         dist_cluster_table = res_dict.join(cluster_result, lambda v1, v2: [v1, v2])
         dist_cluster_table_dbi = res_dict_dbi.join(cluster_result, lambda v1, v2: [v1, v2])
-        dist_table = self.cal_ave_dist(dist_cluster_table, cluster_result)  # ave dist in each cluster
-        dist_table_dbi = self.cal_ave_dist(dist_cluster_table_dbi, cluster_result)
+        dist_table = self.cal_ave_dist(dist_cluster_table)  # ave dist in each cluster
+        dist_table_dbi = self.cal_ave_dist(dist_cluster_table_dbi)
         # if len(dist_table) == 1:
         #    raise ValueError('Only one class detected. DBI calculation error')
         cluster_dist = self.aggregator.sum_model(suffix='predict')
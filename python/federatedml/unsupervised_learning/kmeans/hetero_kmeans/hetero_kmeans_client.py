@@ -26,6 +26,41 @@ from federatedml.util import LOGGER
 from federatedml.util import consts
 
 
+def _cluster_sum_loop(x, clusters, k):
+    feature_sum = np.zeros((k, x.shape[1]))
+    cluster_count = np.zeros(k, dtype=np.int64)
+    for i in range(x.shape[0]):
+        c = clusters[i]
+        cluster_count[c] += 1
+        for j in range(x.shape[1]):
+            feature_sum[c, j] += x[i, j]
+    return feature_sum, cluster_count
+
+
+def _cluster_sum_numpy(x, clusters, k):
+    feature_sum = np.zeros((k, x.shape[1]))
+    np.add.at(feature_sum, clusters, x)
+    cluster_count = np.bincount(clusters, minlength=k).astype(np.int64)
+    return feature_sum, cluster_count
+
+
+# numba is only installed with eggroll, other deployments fall back to numpy
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+if njit is None:
+    _cluster_sum_kernel = _cluster_sum_numpy
+else:
+    try:
+        # compiled kernel is cached on disk, so that workers do not compile it again in every job
+        _cluster_sum_kernel = njit(cache=True)(_cluster_sum_loop)
+    except RuntimeError:
+        # no writable cache directory is found for the module
+        _cluster_sum_kernel = njit(_cluster_sum_loop)
+
+
 class HeteroKmeansClient(BaseKmeansModel):
     def __init__(self):
         super(HeteroKmeansClient, self).__init__()
@@ -33,57 +68,113 @@ class HeteroKmeansClient(BaseKmeansModel):
         # self.cluster_dist_aggregator = secure_sum_aggregator.Client(enable_secure_aggregate=False)
         self.client_dist = None
         self.client_tol = None
+        self.feature_offset = None
         self.aggregator = table_aggregator.Client(enable_secure_aggregate=True)
 
     @staticmethod
-    def educl_dist(u, centroid_list):
-        result = []
-        for c in centroid_list:
-            result.append(np.sum(np.square(np.array(c) - u.features)))
-        return np.array(result)
+    def educl_dist(kv_iterator, centroid_array, centroid_norm, feature_offset):
+        """
+        squared euclidean distances from samples of a partition to all centroids,
+        computed as ||x||^2 + ||c||^2 - 2 * x.c with one matrix product on samples and centroids shifted by
+        feature_offset, centroid_array is shifted centroids of shape (k, feature_num), centroid_norm is their ||c||^2.
+        the matrix product runs in float32, shifting and norms are in float64, centroids are still summed in float64.
+        values of kv_iterator are (features, ||x - feature_offset||^2)
+        """
+        keys, features, x_norm = [], [], []
+        for key, (feature, norm) in kv_iterator:
+            keys.append(key)
+            features.append(feature)
+            x_norm.append(norm)
+
+        if len(keys) == 0:
+            return []
+
+        # shifting keeps values of the float32 product small, so that it does not cancel out distances
+        # of samples lying far from the origin
+        x = (np.asarray(features, dtype=np.float64) - feature_offset).astype(np.float32)
+        x_norm = np.asarray(x_norm, dtype=np.float64)
+        dist = x_norm[:, np.newaxis] + centroid_norm[np.newaxis, :] - 2 * np.dot(x, centroid_array.T).astype(np.float64)
+        # rounding error may make distance of a sample to itself slightly negative
+        np.maximum(dist, 0, out=dist)
+        return list(zip(keys, dist))
+
+    @staticmethod
+    def get_feature_table(data_instances, feature_offset):
+        """
+        table of (features, ||x - feature_offset||^2) shared by all passes of all iterations, so that distance and
+        centroid passes do not deserialize whole instances again and again, and squared norms of samples are computed
+        only once
+        """
+        def _feature_and_norm(inst):
+            shifted = inst.features - feature_offset
+            return inst.features, float(np.dot(shifted, shifted))
+
+        return data_instances.mapValues(_feature_and_norm)
+
+    def cal_dist_table(self, feature_table, centroids):
+        # shifted centroids and their norms are prepared once for all partitions
+        shifted_centroids = np.asarray(centroids, dtype=np.float64) - self.feature_offset
+        centroid_array = np.ascontiguousarray(shifted_centroids, dtype=np.float32)
+        centroid_norm = np.einsum('ij,ij->i', shifted_centroids, shifted_centroids)
+        d = functools.partial(self.educl_dist, centroid_array=centroid_array, centroid_norm=centroid_norm,
+                              feature_offset=self.feature_offset)
+        return feature_table.mapPartitions(d, use_previous_behavior=False, preserves_partitioning=True)
 
     def get_centroid(self, data_instances):
-        random_key = []
-        key = list(data_instances.mapValues(lambda data_instance: None).collect())
-        random_list = list(np.random.choice(data_instances.count(), self.k, replace=False))
-        for k in random_list:
-            random_key.append(key[k][0])
-        return random_key
+        key = [k for k, _ in data_instances.mapValues(lambda data_instance: None).collect()]
+        random_list = np.random.choice(len(key), self.k, replace=False)
+        return [key[k] for k in random_list]
 
     def cluster_sum(self, iterator):
-        cluster_result = dict()
+        """
+        feature sums of shape (k, feature_num) and sample counts of shape (k,) of clusters in a partition
+        """
+        features, clusters = [], []
         for k, v in iterator:
-            if v[1] not in cluster_result:
-                cluster_result[v[1]] = v[0]
-            else:
-                cluster_result[v[1]] += v[0]
-        return cluster_result
-
-    def centroid_cal(self, cluster_result, data_instances):
-        cluster_result_table = data_instances.join(cluster_result, lambda v1, v2: [v1.features, v2])
-        centroid_feature_sum = cluster_result_table.applyPartitions(self.cluster_sum).reduce(self.sum_dict)
-        cluster_count = cluster_result.applyPartitions(self.count).reduce(self.sum_dict)
-        centroid_list = []
+            features.append(v[0])
+            clusters.append(v[1])
+
+        if len(features) == 0:
+            return None, np.zeros(self.k, dtype=np.int64)
+
+        return _cluster_sum_kernel(np.asarray(features, dtype=np.float64), np.asarray(clusters, dtype=np.int64),
+                                   self.k)
+
+    @staticmethod
+    def merge_cluster_sum(s1, s2):
+        # feature sum of an empty partition is None
+        if s1[0] is None:
+            return s2
+        if s2[0] is None:
+            return s1
+        return s1[0] + s2[0], s1[1] + s2[1]
+
+    def centroid_cal(self, cluster_result, feature_table):
+        # feature sums and counts of all clusters are computed in one pass
+        cluster_result_table = feature_table.join(cluster_result, lambda v1, v2: [v1[0], v2])
+        feature_sum, cluster_count = cluster_result_table.applyPartitions(self.cluster_sum)\
+            .reduce(self.merge_cluster_sum)
+        # centroids are kept in a (k, feature_num) array, empty clusters keep their previous centroids
+        centroids = np.array(self.centroid_list, dtype=np.float64)
+        non_empty = cluster_count > 0
+        centroids[non_empty] = feature_sum[non_empty] / cluster_count[non_empty, np.newaxis]
+
+        count_all = int(cluster_count.sum())
         cluster_count_list = []
-        count_all = data_instances.count()
-        # for k in centroid_feature_sum:
         for k in range(self.k):
-            if k not in centroid_feature_sum:
-                centroid_list.append(self.centroid_list[int(k)])
-                cluster_count_list.append([k, 0, 0])
-            else:
-                count = cluster_count[k]
-                centroid_list.append(centroid_feature_sum[k] / count)
-                cluster_count_list.append([k, count, count / count_all])
-        return centroid_list, cluster_count_list
-
-    def centroid_dist(self, centroid_list):
-        cluster_dist_list = []
-        for i in range(0, len(centroid_list)):
-            for j in range(0, len(centroid_list)):
-                if j != i:
-                    cluster_dist_list.append(np.sum((np.array(centroid_list[i]) - np.array(centroid_list[j])) ** 2))
-        return cluster_dist_list
+            count = int(cluster_count[k])
+            cluster_count_list.append([k, count, count / count_all] if count > 0 else [k, 0, 0])
+        return centroids, cluster_count_list
+
+    @staticmethod
+    def centroid_dist(centroid_list):
+        """
+        squared distances between each pair of different centroids, in order of (i, j) for i, j in range(k), i != j
+        """
+        centroid_array = np.asarray(centroid_list)
+        diff = centroid_array[:, np.newaxis, :] - centroid_array[np.newaxis, :, :]
+        pair_dist = np.einsum('ijk,ijk->ij', diff, diff)
+        return list(pair_dist[~np.eye(len(centroid_array), dtype=bool)])
 
     def fit(self, data_instances, validate_data=None):
         LOGGER.info("Enter hetero_kmenas_client fit")
@@ -97,26 +188,33 @@ class HeteroKmeansClient(BaseKmeansModel):
         if self.role == consts.GUEST:
             first_centroid_key = self.get_centroid(data_instances)
             self.transfer_variable.centroid_list.remote(first_centroid_key, role=consts.HOST, idx=-1)
-            # rand = np.random.rand(data_instances.count())
         else:
             first_centroid_key = self.transfer_variable.centroid_list.get(idx=0)
-            # rand = -np.random.rand(data_instances.count())
         key_table = session.parallelize(tuple(zip(first_centroid_key, first_centroid_key)),
                                         partition=data_instances.partitions, include_key=True)
         centroid_list = list(key_table.join(data_instances, lambda v1, v2: v2.features).collect())
-        self.centroid_list = [v[1] for v in centroid_list]
+        self.centroid_list = np.array([v[1] for v in centroid_list], dtype=np.float64)
+        # samples and centroids are shifted by mean of initial centroids in distance computation
+        self.feature_offset = self.centroid_list.mean(axis=0)
+        feature_table = self.get_feature_table(data_instances, self.feature_offset)
 
+        dist_all_table = self.cal_dist_table(feature_table, self.centroid_list)
         while self.n_iter_ < self.max_iter:
             self.send_cluster_dist(self.n_iter_,self.centroid_list)
-            d = functools.partial(self.educl_dist, centroid_list=self.centroid_list)
-            dist_all_table = data_instances.mapValues(d)
+            # each party holds part of the features, so distances are partial and only their sum over parties
+            # decides the nearest cluster, labels can not be computed locally
             cluster_result = self.aggregator.aggregate_then_get_table(dist_all_table, suffix=(self.n_iter_,))
-            centroid_new, self.cluster_count = self.centroid_cal(cluster_result, data_instances)
+            centroid_new, self.cluster_count = self.centroid_cal(cluster_result, feature_table)
 
             # cluster_dist = self.centroid_dist(self.centroid_list)
             # self.cluster_dist_aggregator.send_model(NumpyWeights(np.array(cluster_dist)), suffix=(self.n_iter_,))
-            client_tol = np.sum(np.sum((np.array(self.centroid_list) - np.array(centroid_new)) ** 2, axis=1))
+            # einsum sums squared deltas without allocating the squared array
+            centroid_delta = centroid_new - self.centroid_list
+            client_tol = float(np.einsum('ij,ij->', centroid_delta, centroid_delta))
             self.client_tol.remote(client_tol, role=consts.ARBITER, idx=0, suffix=(self.n_iter_,))
+            # distances to new centroids are used by next iteration or final round dbi either way,
+            # compute them while arbiter is checking convergence
+            dist_all_table = self.cal_dist_table(feature_table, centroid_new)
             self.is_converged = self.transfer_variable.arbiter_tol.get(idx=0, suffix=(self.n_iter_,))
 
             self.centroid_list = centroid_new
@@ -130,14 +228,14 @@ class HeteroKmeansClient(BaseKmeansModel):
                 break
 
         # calculate finall round dbi
-        self.extra_dbi(data_instances, self.n_iter_, self.centroid_list)
-        centroid_new, self.cluster_count = self.centroid_cal(self.cluster_result, data_instances)
-        self.extra_dbi(data_instances, (self.n_iter_ + 1), centroid_new)
+        self.extra_dbi(feature_table, self.n_iter_, self.centroid_list, dist_all_table=dist_all_table)
+        centroid_new, self.cluster_count = self.centroid_cal(self.cluster_result, feature_table)
+        self.extra_dbi(feature_table, (self.n_iter_ + 1), centroid_new)
         # LOGGER.debug(f"Final centroid list: {self.centroid_list}")
 
-    def extra_dbi(self, data_instances, suffix, centroids):
-        d = functools.partial(self.educl_dist, centroid_list=centroids)
-        dist_all_table = data_instances.mapValues(d)
+    def extra_dbi(self, feature_table, suffix, centroids, dist_all_table=None):
+        if dist_all_table is None:
+            dist_all_table = self.cal_dist_table(feature_table, centroids)
         self.cluster_result = self.aggregator.aggregate_then_get_table(dist_all_table, suffix=(suffix,))
         self.send_cluster_dist(suffix, centroids)
 
@@ -149,12 +247,12 @@ class HeteroKmeansClient(BaseKmeansModel):
         LOGGER.info("Start predict ...")
         self.header = self.get_header(data_instances)
         self._abnormal_detection(data_instances)
-        d = functools.partial(self.educl_dist, centroid_list=self.centroid_list)
-        dist_all_table = data_instances.mapValues(d)
+        self.feature_offset = np.asarray(self.centroid_list, dtype=np.float64).mean(axis=0)
+        feature_table = self.get_feature_table(data_instances, self.feature_offset)
+        dist_all_table = self.cal_dist_table(feature_table, self.centroid_list)
         cluster_result = self.aggregator.aggregate_then_get_table(dist_all_table, suffix='predict')
-        centroid_new, self.cluster_count = self.centroid_cal(cluster_result, data_instances)
-        d = functools.partial(self.educl_dist, centroid_list=centroid_new)
-        dist_all_table = data_instances.mapValues(d)
+        centroid_new, self.cluster_count = self.centroid_cal(cluster_result, feature_table)
+        dist_all_table = self.cal_dist_table(feature_table, centroid_new)
         cluster_result_dbi = self.aggregator.aggregate_then_get_table(dist_all_table, suffix='predict_dbi')
         cluster_dist = self.centroid_dist(centroid_new)
         self.aggregator.send_model(NumpyWeights(np.array(cluster_dist)), suffix='predict')
@@ -106,10 +106,12 @@ class BaseKmeansModel(ModelBase):
 
     @staticmethod
     def sum_dict(d1, d2):
-        temp = dict()
-        for key in d1.keys() | d2.keys():
-            temp[key] = sum([d.get(key, 0) for d in (d1, d2)])
-        return temp
+        # values may be counts or feature arrays, each shared key takes one add,
+        # keys are returned in sorted order as callers list clusters by their ids
+        temp = dict(d1)
+        for key, value in d2.items():
+            temp[key] = temp[key] + value if key in temp else value
+        return {key: temp[key] for key in sorted(temp)}
 
     def _abnormal_detection(self, data_instances):
         """
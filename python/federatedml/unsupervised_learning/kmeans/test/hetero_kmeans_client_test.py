@@ -0,0 +1,60 @@
+import unittest
+
+import numpy as np
+
+from federatedml.unsupervised_learning.kmeans.hetero_kmeans import hetero_kmeans_client
+from federatedml.unsupervised_learning.kmeans.hetero_kmeans.hetero_kmeans_client import HeteroKmeansClient
+
+
+class TestHeteroKmeansClient(unittest.TestCase):
+    def setUp(self):
+        self.k = 4
+        self.x = np.random.random((100, 5))
+        self.clusters = np.random.randint(0, self.k, 100)
+
+    def test_cluster_sum_numpy_fallback(self):
+        feature_sum, cluster_count = hetero_kmeans_client._cluster_sum_numpy(self.x, self.clusters, self.k)
+        expect_sum, expect_count = hetero_kmeans_client._cluster_sum_loop(self.x, self.clusters, self.k)
+        self.assertTrue(np.allclose(feature_sum, expect_sum))
+        self.assertTrue(np.array_equal(cluster_count, expect_count))
+
+    def test_cluster_sum_without_numba(self):
+        kernel = hetero_kmeans_client._cluster_sum_kernel
+        hetero_kmeans_client._cluster_sum_kernel = hetero_kmeans_client._cluster_sum_numpy
+        try:
+            client = HeteroKmeansClient()
+            client.k = self.k
+            # the last cluster is empty
+            clusters = np.minimum(self.clusters, self.k - 2)
+            iterator = [(i, [self.x[i], clusters[i]]) for i in range(len(self.x))]
+            feature_sum, cluster_count = client.cluster_sum(iterator)
+        finally:
+            hetero_kmeans_client._cluster_sum_kernel = kernel
+
+        for c in range(self.k):
+            self.assertTrue(np.allclose(feature_sum[c], self.x[clusters == c].sum(axis=0)))
+            self.assertEqual(cluster_count[c], np.sum(clusters == c))
+
+    def test_educl_dist_with_large_offset(self):
+        # two tight clusters lying far from the origin
+        offset = 1e6
+        x = np.vstack([offset + np.random.normal(0, 1, (50, 5)), offset + 3 + np.random.normal(0, 1, (50, 5))])
+        centroids = np.vstack([x[0], x[50]])
+
+        client = HeteroKmeansClient()
+        client.feature_offset = centroids.mean(axis=0)
+        shifted_centroids = centroids - client.feature_offset
+        kvs = [(i, (x[i], float(np.dot(x[i] - client.feature_offset, x[i] - client.feature_offset))))
+               for i in range(len(x))]
+        dist = dict(client.educl_dist(iter(kvs), shifted_centroids.astype(np.float32),
+                                      np.einsum('ij,ij->i', shifted_centroids, shifted_centroids),
+                                      client.feature_offset))
+
+        expect_dist = ((x[:, np.newaxis, :] - centroids[np.newaxis, :, :]) ** 2).sum(axis=2)
+        for i in range(len(x)):
+            self.assertTrue(np.allclose(dist[i], expect_dist[i], atol=1e-3))
+            self.assertEqual(np.argmin(dist[i]), np.argmin(expect_dist[i]))
+
+
+if __name__ == '__main__':
+    unittest.main()
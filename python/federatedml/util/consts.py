@@ -33,6 +33,7 @@ NONE = "None"
 AFFINE = 'Affine'
 ITERATIVEAFFINE = 'IterativeAffine'
 RANDOM_ITERATIVEAFFINE = 'RandomIterativeAffine'
+IPCL = 'IPCL'
 L1_PENALTY = 'L1'
 L2_PENALTY = 'L2'
 
@@ -46,6 +47,7 @@ AES = 'aes'
 PARAM_MAXDEPTH = 5
 MAX_CLASSNUM = 1000
 MIN_BATCH_SIZE = 10
+ENCRYPT_BUFFER_SIZE = 8
 SPARSE_VECTOR = "SparseVector"
 
 HETERO = "hetero"